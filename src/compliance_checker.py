@@ -4,6 +4,7 @@ from typing import Optional
 from .core.rule_engine import RuleEngine
 from .core.scanner import ComplianceScanner
 from .core.downloader import RepositoryDownloader
+from .core.cache import ScanCache
 from .services.ai_analyzer import AIAnalyzer
 from .services.report_generator import ReportGenerator
 from .models.repository import RepositoryInfo
@@ -19,7 +20,12 @@ class ComplianceChecker:
 
         # Initialize components
         self.rule_engine = RuleEngine(rules_file or self.config["rules_file"])
-        self.scanner = ComplianceScanner(self.rule_engine)
+        self.scanner = ComplianceScanner(
+            self.rule_engine,
+            max_workers=self.config["scan_workers"],
+            max_scan_bytes=int(self.config["max_file_size_mb"] * 1024 * 1024),
+            cache=self._initialize_scan_cache(),
+        )
         self.downloader = RepositoryDownloader()
         self.ai_analyzer = AIAnalyzer()
         self.report_generator = ReportGenerator(self.config["output_dir"])
@@ -30,6 +36,18 @@ class ComplianceChecker:
                 "No compliance rules loaded. Please check your rules file."
             )
 
+    def _initialize_scan_cache(self) -> Optional[ScanCache]:
+        """Open the cache of per-file scan results, if enabled"""
+        cache_file = self.config["scan_cache_file"]
+        if not cache_file:
+            return None
+
+        try:
+            return ScanCache(cache_file)
+        except Exception as e:
+            print(f"Warning: Scan cache unavailable ({e}). All files will be scanned.")
+            return None
+
     def check_repository(self, repo_url: str) -> ComplianceReport:
         """Main method to check repository compliance"""
         start_time = time.time()
@@ -42,8 +60,9 @@ class ComplianceChecker:
             if not repo_info:
                 raise Exception("Failed to download repository")
 
-            # Step 2: Scan for violations
-            violations = self.scanner.scan_repository(repo_info)
+            # Step 2: Scan for violations; the full report lists every one,
+            # so build the violation objects once here
+            violations = list(self.scanner.scan_repository(repo_info))
 
             # Step 3: Generate AI recommendations
             recommendations = self.ai_analyzer.generate_recommendations(violations)
@@ -73,7 +92,8 @@ class ComplianceChecker:
         self.report_generator.print_console_report(report)
 
         # Save reports
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        # Named after the scan time recorded in the report
+        timestamp = self.report_generator.file_timestamp(report)
         base_filename = f"compliance_report_{repo_info.name}_{timestamp}"
 
         # Save JSON report
@@ -107,17 +127,10 @@ class ComplianceChecker:
                 "top_violations": [],
             }
 
-            # Count by severity
-            for violation in violations:
-                severity = violation.severity
-                summary["severity_breakdown"][severity] = (
-                    summary["severity_breakdown"].get(severity, 0) + 1
-                )
-
-            # Get top violations
-            top_violations = sorted(violations, key=lambda x: x.severity, reverse=True)[
-                :5
-            ]
+            # Count by severity and pick the most severe from the columns,
+            # building violation objects only for the top ones
+            summary["severity_breakdown"] = violations.severity_counts()
+            top_violations = violations.top(5)
             summary["top_violations"] = [
                 {
                     "rule_id": v.rule_id,
@@ -1,5 +1,6 @@
 from .rule_engine import RuleEngine
 from .scanner import ComplianceScanner
 from .downloader import RepositoryDownloader
+from .cache import ScanCache
 
-__all__ = ["RuleEngine", "ComplianceScanner", "RepositoryDownloader"]
+__all__ = ["RuleEngine", "ComplianceScanner", "RepositoryDownloader", "ScanCache"]
@@ -0,0 +1,32 @@
+"""Byte-level scanning kernels, JIT-compiled with Numba when it is installed"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # optional; callers check scan_bytes before using it
+    np = None
+    njit = None
+
+
+if njit is not None:
+
+    @njit(cache=True, nogil=True)
+    def scan_bytes(buf):
+        """Return the line start offsets of uint8 data"""
+        n = buf.shape[0]
+        # Count first, so the result is sized to the lines, not the bytes
+        count = 0
+        for i in range(n):
+            if buf[i] == 10:
+                count += 1
+        starts = np.empty(count + 1, np.int64)
+        starts[0] = 0
+        k = 1
+        for i in range(n):
+            if buf[i] == 10:
+                starts[k] = i + 1
+                k += 1
+        return starts
+
+else:
+    scan_bytes = None
@@ -0,0 +1,125 @@
+import json
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from ..models.compliance import ComplianceViolation, ViolationBuffer
+
+
+class ScanCache:
+    """Persists per-file scan results so unchanged files are not rescanned"""
+
+    def __init__(self, db_path: str | Path, timeout: float = 5.0):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Seconds to wait for another process holding the write lock
+        self.connection = sqlite3.connect(str(self.db_path), timeout=timeout)
+        # New mtimes of files recognised by digest, written on commit() so
+        # lookups never hold the write lock while a scan runs
+        self._pending_mtimes: List[Tuple[float, str, str]] = []
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS scan_results (
+                repository TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                rules_hash TEXT NOT NULL,
+                violations_json TEXT NOT NULL,
+                PRIMARY KEY (repository, path)
+            )
+            """)
+
+    def lookup(
+        self,
+        repository: str,
+        path: str,
+        mtime: float,
+        size: int,
+        rules_hash: str,
+        compute_digest: Callable[[], str],
+        trust_mtime: bool = True,
+    ) -> Tuple[Optional[ViolationBuffer], Optional[str]]:
+        """Return (cached violations or None, content digest if one was computed)
+
+        With trust_mtime False the digest is always compared, for files whose
+        mtime does not reliably change with their content.
+        """
+        row = self.connection.execute(
+            "SELECT mtime, size, digest, rules_hash, violations_json "
+            "FROM scan_results WHERE repository = ? AND path = ?",
+            (repository, path),
+        ).fetchone()
+
+        if row is None or row[1] != size or row[3] != rules_hash:
+            return None, None
+
+        # Same mtime and size: trust the file is unchanged without reading it
+        if trust_mtime and row[0] == mtime:
+            return self._load_violations(row[4]), None
+
+        # Freshly extracted archives get new mtimes, so compare content instead
+        digest = compute_digest()
+        if not digest or digest != row[2]:
+            return None, digest
+
+        violations = self._load_violations(row[4])
+        if violations is not None and row[0] != mtime:
+            self._pending_mtimes.append((mtime, repository, path))
+        return violations, digest
+
+    def store(
+        self,
+        repository: str,
+        path: str,
+        mtime: float,
+        size: int,
+        rules_hash: str,
+        digest: str,
+        violations: ViolationBuffer,
+    ) -> None:
+        """Record the scan result for a file"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO scan_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                repository,
+                path,
+                mtime,
+                size,
+                digest,
+                rules_hash,
+                json.dumps([asdict(v) for v in violations]),
+            ),
+        )
+
+    def commit(self) -> None:
+        """Flush pending writes to disk"""
+        try:
+            self.connection.executemany(
+                "UPDATE scan_results SET mtime = ? WHERE repository = ? AND path = ?",
+                self._pending_mtimes,
+            )
+            self.connection.commit()
+        finally:
+            self._pending_mtimes = []
+
+    def rollback(self) -> None:
+        """Discard pending writes, releasing any lock they hold"""
+        self._pending_mtimes = []
+        self.connection.rollback()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self.connection.close()
+
+    def _load_violations(self, violations_json: str) -> Optional[ViolationBuffer]:
+        """Rebuild violations from their stored JSON form, or None if unreadable"""
+        violations = ViolationBuffer()
+        try:
+            for data in json.loads(violations_json):
+                violations.add(ComplianceViolation(**data))
+        except (ValueError, TypeError) as e:
+            # A corrupt or outdated row is treated as a miss and rescanned
+            print(f"Warning: Ignoring unreadable scan cache entry: {e}")
+            return None
+        return violations
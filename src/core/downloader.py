@@ -1,24 +1,57 @@
 import os
+import shutil
+import subprocess
 import tempfile
-import zipfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Optional
+from typing import Container, Optional, Tuple
+from urllib.parse import urlparse
 from ..models.repository import RepositoryInfo
 from ..utils.config import get_config
+from ..utils.file_utils import FileUtils
+from .source import ZipRepositorySource
 
 
 class RepositoryDownloader:
     """Handles downloading and extracting repositories from various sources"""
 
+    # Archives up to this size stay in memory; larger ones spill to a temp file
+    ARCHIVE_SPOOL_BYTES = 64 * 1024 * 1024
+    DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+    GIT_TIMEOUT_SECONDS = 600
+    CLONE_HOSTS = ("github.com", "gitlab.com")
+    # Connect and per-read timeouts, not a limit on the whole download
+    DOWNLOAD_TIMEOUT_SECONDS = (10, 60)
+
     def __init__(self):
         self.config = get_config()
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Repository-Compliance-copilot/1.0"})
+        # Reuse pooled connections and retry transient failures with backoff
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def download_repository(self, repo_url: str) -> Optional[RepositoryInfo]:
         """Download repository from URL and return repository info"""
         try:
+            if "github.com" in repo_url or "gitlab.com" in repo_url:
+                # Prefer a cached shallow clone; the archive is the fallback
+                repo_info = self._clone_repository(repo_url)
+                if repo_info:
+                    return repo_info
+
             if "github.com" in repo_url:
                 return self._download_github_repo(repo_url)
             elif "gitlab.com" in repo_url:
@@ -30,6 +63,120 @@ class RepositoryDownloader:
             print(f"Error downloading repository: {e}")
             return None
 
+    def _clone_repository(self, repo_url: str) -> Optional[RepositoryInfo]:
+        """Clone or update a cached shallow copy of the repository with git"""
+        cache_dir = self.config.get("clone_cache_dir")
+        if not cache_dir or shutil.which("git") is None:
+            return None
+
+        if repo_url.endswith(".git"):
+            repo_url = repo_url[:-4]
+
+        # Only known hosts over https; the URL also becomes the cache path
+        parsed = urlparse(repo_url)
+        host = parsed.netloc.lower()
+        if parsed.scheme != "https" or host not in self.CLONE_HOSTS:
+            return None
+
+        parts = [part for part in parsed.path.split("/") if part]
+        if len(parts) < 2 or any(part in (".", "..") for part in parts):
+            return None
+
+        repo_name = parts[-1]
+        cache_root = Path(cache_dir).expanduser().resolve()
+        clone_dir = (cache_root / host / Path(*parts)).resolve()
+        # Never clean up or replace anything outside the cache directory
+        if clone_dir == cache_root or not clone_dir.is_relative_to(cache_root):
+            return None
+
+        try:
+            if (clone_dir / ".git").is_dir():
+                print(f"Updating cached clone: {clone_dir}")
+                try:
+                    # Only objects that changed since the last run are transferred
+                    self._run_git("fetch", "--depth", "1", "origin", cwd=clone_dir)
+                    self._run_git("reset", "--hard", "FETCH_HEAD", cwd=clone_dir)
+                    self._run_git("clean", "-ffdx", cwd=clone_dir)
+                except subprocess.SubprocessError as e:
+                    if self._has_valid_head(clone_dir):
+                        # e.g. the network is down; keep the clone for next time
+                        print(f"Cached clone could not be updated ({e})")
+                        return None
+                    # A clone interrupted part way cannot recover; start it over
+                    print(f"Cached clone is broken ({e}), cloning again")
+                    self._clone_into(repo_url, clone_dir)
+            else:
+                self._clone_into(repo_url, clone_dir)
+
+            # The clone checks out the remote's default branch, whatever its name
+            branch = self._run_git("rev-parse", "--abbrev-ref", "HEAD", cwd=clone_dir)
+            commit_hash = self._run_git("rev-parse", "HEAD", cwd=clone_dir)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Git clone unavailable ({e}), downloading archive instead")
+            return None
+
+        size_bytes, file_count = self._calculate_directory_stats(
+            clone_dir, excluded_dirs=(".git",)
+        )
+        print(f"Size: {size_bytes / (1024*1024):.2f} MB, Files: {file_count}")
+
+        return RepositoryInfo(
+            url=repo_url,
+            name=repo_name,
+            local_path=clone_dir,
+            branch=branch,
+            commit_hash=commit_hash,
+            size_bytes=size_bytes,
+            file_count=file_count,
+        )
+
+    def _has_valid_head(self, clone_dir: Path) -> bool:
+        """Check whether a cached clone has a commit checked out"""
+        try:
+            # An explicit git dir stops git from finding an enclosing repository
+            self._run_git(
+                "--git-dir",
+                str(clone_dir / ".git"),
+                "rev-parse",
+                "--verify",
+                "--quiet",
+                "HEAD",
+            )
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return True
+
+    def _clone_into(self, repo_url: str, clone_dir: Path) -> None:
+        """Make a fresh shallow clone, replacing whatever is at clone_dir"""
+        print(f"Cloning repository: {repo_url}")
+        if clone_dir.exists():
+            shutil.rmtree(clone_dir)
+        clone_dir.parent.mkdir(parents=True, exist_ok=True)
+        self._run_git(
+            "clone",
+            "--depth",
+            "1",
+            "--filter=blob:none",
+            "--single-branch",
+            "--",
+            repo_url,
+            str(clone_dir),
+        )
+
+    def _run_git(self, *args: str, cwd: Optional[Path] = None) -> str:
+        """Run a git command and return its trimmed output"""
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.GIT_TIMEOUT_SECONDS,
+            # Fail instead of waiting for credentials on private repositories
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+        return result.stdout.strip()
+
     def _download_github_repo(self, repo_url: str) -> Optional[RepositoryInfo]:
         """Download repository from github"""
         try:
@@ -85,81 +232,68 @@ class RepositoryDownloader:
     def _download_and_extract(
         self, download_url: str, repo_name: str
     ) -> Optional[RepositoryInfo]:
-        """Download and extract repository archieve"""
+        """Download repository archieve and open it for scanning in place"""
+        archive = None
         try:
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp()
-            zip_path = Path(temp_dir) / "repo.zip"
-
             # Download the repository
-            response = self.session.get(download_url, stream=True)
+            response = self.session.get(
+                download_url, stream=True, timeout=self.DOWNLOAD_TIMEOUT_SECONDS
+            )
             response.raise_for_status()
 
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # Extract the repository
-            extract_dir = Path(temp_dir) / "extracted"
-            extract_dir.mkdir(exist_ok=True)
-
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(extract_dir)
-
-            # Find the actual repository directory
-            extracted_items = list(extract_dir.iterdir())
-            if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                repo_dir = extracted_items[0]
-            else:
-                repo_dir = extract_dir
-
-            # Calculate repository size
-            size_bytes = self._calculate_directory_size(repo_dir)
-            file_count = self._count_files(repo_dir)
-
-            print(f"Repository extracted to: {repo_dir}")
-            print(f"Size: {size_bytes / (1024*1024):.2f} MB, Files: {file_count}")
+            # Keep the archive in memory unless it is large, instead of
+            # writing it to disk only to read it back for extraction
+            archive = tempfile.SpooledTemporaryFile(max_size=self.ARCHIVE_SPOOL_BYTES)
+            for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_BYTES):
+                archive.write(chunk)
+            archive.seek(0)
+
+            # Files are read from the archive as they are scanned, so nothing
+            # is extracted to disk
+            source = ZipRepositorySource(archive)
+
+            print(f"Repository archive downloaded: {download_url}")
+            print(
+                f"Size: {source.size_bytes / (1024*1024):.2f} MB, "
+                f"Files: {source.file_count}"
+            )
 
             return RepositoryInfo(
                 url=download_url,
                 name=repo_name,
-                local_path=repo_dir,
+                local_path=None,
                 branch="main",
-                size_bytes=size_bytes,
-                file_count=file_count,
+                size_bytes=source.size_bytes,
+                file_count=source.file_count,
+                source=source,
             )
         except Exception as e:
             print(f"Error in download and extract: {e}")
+            if archive is not None:
+                archive.close()
             return None
 
-    def _calculate_directory_size(self, directory: Path) -> int:
-        """Calculate total size of directory in bytes"""
+    def _calculate_directory_stats(
+        self, directory: Path, excluded_dirs: Container[str] = ()
+    ) -> Tuple[int, int]:
+        """Calculate total size in bytes and file count in a single walk"""
         total_size = 0
-        try:
-            for file_path in directory.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-        except Exception:
-            pass
-
-        return total_size
+        file_count = 0
+        for entry in FileUtils.walk_files(directory, excluded_dirs):
+            try:
+                total_size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                pass
+            file_count += 1
 
-    def _count_files(self, directory: Path) -> int:
-        """Count total number of files in directory"""
-        try:
-            return len([f for f in directory.rglob("*") if f.is_file()])
-        except Exception:
-            return 0
+        return total_size, file_count
 
     def cleanup(self, repo_info: RepositoryInfo) -> None:
         """Clean Up temporary repository files"""
+        # Archives are never extracted and cached clones are kept for the
+        # next run, so only the open archive needs releasing
         try:
-            if repo_info.local_path.exists():
-                # Remove the entire temp directory
-                temp_dir = repo_info.local_path.parents[1]
-                import shutil
-
-                shutil.rmtree(temp_dir)
-                print("Temporary files cleaned up")
+            if repo_info.source is not None:
+                repo_info.source.close()
         except Exception as e:
             print(f"Error cleaning up: {e}")
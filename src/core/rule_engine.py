@@ -1,8 +1,131 @@
+import bisect
+import hashlib
 import json
 import re
-from pathlib import Path
-from typing import List, Dict, Any
+from pathlib import PurePath
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.compliance import ComplianceRule
+from ..utils.file_utils import _glob_segment_to_regex, _glob_to_regex
+from . import _fastscan
+
+try:
+    import numpy as np
+except ImportError:  # optional; line lookups fall back to bisect
+    np = None
+
+# Leading global flags such as "(?i)" must become scoped "(?i:...)" groups
+# once a pattern is embedded in an alternation
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Numbered backreferences would point at the wrong group inside a union
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]")
+
+# String anchors and lookarounds see past a line when the whole file is
+# searched, so such patterns are only ever run on each line by itself
+_LINE_CONTEXT_RE = re.compile(r"\\[AZ]|\(\?<?[=!]")
+
+_GLOB_CHARS = "*?["
+
+# Below this many matches in a file, bisect beats building NumPy arrays
+_VECTORIZE_MIN_MATCHES = 20
+
+# Patterns run over raw file bytes; MULTILINE keeps ^ and $ anchored per line
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+def _compile_bytes(pattern: str) -> re.Pattern:
+    """Compile a rule pattern for matching against raw file bytes"""
+    return re.compile(pattern.encode("utf-8"), _REGEX_FLAGS)
+
+
+def _match_text(match: re.Match) -> str:
+    """Decode a match, widened so it never ends part way through a character"""
+    line = match.string
+    start, end = match.span()
+    # UTF-8 continuation bytes (0b10xxxxxx) never begin a character
+    while 0 < start < len(line) and 0x80 <= line[start] <= 0xBF:
+        start -= 1
+    while end < len(line) and 0x80 <= line[end] <= 0xBF:
+        end += 1
+    return _decode_text(line[start:end])
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode a slice of file content for reporting"""
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+class LineIndex:
+    """Maps byte offsets in a file's content to line numbers, built on first use"""
+
+    def __init__(self, content: bytes):
+        # bytes or a memory-mapped file
+        self.content = content
+        self._line_starts: Optional[List[int]] = None
+        self._line_starts_np = None
+
+    @property
+    def line_starts(self) -> List[int]:
+        """Offset at which each line of the content starts"""
+        if self._line_starts is None:
+            if _fastscan.scan_bytes is not None:
+                self._line_starts = self._line_starts_array().tolist()
+                return self._line_starts
+
+            line_starts = [0]
+            newline = self.content.find(b"\n")
+            while newline != -1:
+                line_starts.append(newline + 1)
+                newline = self.content.find(b"\n", newline + 1)
+            self._line_starts = line_starts
+        return self._line_starts
+
+    def locate(self, offset: int) -> Tuple[int, int, int]:
+        """Return (line_number, line_start, line_end) for an offset"""
+        line_starts = self.line_starts
+        line_num = bisect.bisect_right(line_starts, offset)
+        line_start = line_starts[line_num - 1]
+        if line_num < len(line_starts):
+            line_end = line_starts[line_num] - 1
+        else:
+            line_end = len(self.content)
+        return line_num, line_start, line_end
+
+    def locate_all(self, offsets: List[int]) -> List[Tuple[int, int, int]]:
+        """Return (line_number, line_start, line_end) for each offset"""
+        if np is None or len(offsets) < _VECTORIZE_MIN_MATCHES:
+            return [self.locate(offset) for offset in offsets]
+
+        # Line starts plus a sentinel one past the end, so every line has an end
+        bounds = np.append(self._line_starts_array(), len(self.content) + 1)
+        line_nums = np.searchsorted(bounds, offsets, side="right")
+        line_starts = bounds[line_nums - 1]
+        line_ends = bounds[line_nums] - 1
+        return list(zip(line_nums.tolist(), line_starts.tolist(), line_ends.tolist()))
+
+    def _line_starts_array(self):
+        """Line start offsets as a NumPy array, found with a vectorized scan"""
+        if self._line_starts_np is not None:
+            return self._line_starts_np
+        if self._line_starts is not None:
+            return np.asarray(self._line_starts, dtype=np.int64)
+
+        data = np.frombuffer(self.content, dtype=np.uint8)
+        if _fastscan.scan_bytes is not None:
+            # One compiled pass, only once a match needs its line number
+            line_starts = _fastscan.scan_bytes(data)
+        else:
+            newlines = np.flatnonzero(data == 10)
+            line_starts = np.empty(len(newlines) + 1, dtype=np.int64)
+            line_starts[0] = 0
+            line_starts[1:] = newlines + 1
+        # Release the view so a memory-mapped file can be closed afterwards
+        del data
+        self._line_starts_np = line_starts
+        return line_starts
 
 
 class RuleEngine:
@@ -11,6 +134,9 @@ class RuleEngine:
     def __init__(self, rules_file: str = "config/rules.json"):
         self.rules_file = rules_file
         self.rules: List[ComplianceRule] = []
+        self.master_regex: Optional[re.Pattern] = None
+        # Fingerprint of the loaded rules; cached scan results are keyed on it
+        self.rules_hash = ""
         self._load_rules()
 
     def _load_rules(self):
@@ -19,6 +145,9 @@ class RuleEngine:
             with open(self.rules_file, "r", encoding="utf-8") as f:
                 rules_data = json.load(f)
 
+            self.rules_hash = hashlib.sha256(
+                json.dumps(rules_data, sort_keys=True).encode("utf-8")
+            ).hexdigest()
             self.rules = []
             for rule_data in rules_data:
                 rule = ComplianceRule(
@@ -31,8 +160,10 @@ class RuleEngine:
                     compliance_mapping=rule_data["compliance_mapping"],
                     fix_suggestion=rule_data["fix_suggestion"],
                 )
+                self._compile_rule(rule)
                 self.rules.append(rule)
 
+            self.master_regex = self._build_master_regex(self.rules)
             print(f"Loaded {len(self.rules)} compliance rules from {self.rules_file}")
 
         except FileNotFoundError:
@@ -45,6 +176,102 @@ class RuleEngine:
             print(f"Error loading rules: {e}")
             self.rules = []
 
+    def _compile_rule(self, rule: ComplianceRule) -> None:
+        """Pre-compile a rule's regex patterns so matching skips the re cache"""
+        # file_regex is always set here, so it marks the rule as compiled
+        compiled_regex = []
+        for pattern in rule.regex_patterns:
+            try:
+                compiled_regex.append(_compile_bytes(pattern))
+            except re.error as e:
+                # Invalid patterns are reported by validate_rule()
+                print(f"Invalid regex pattern {pattern} in rule {rule.id}: {e}")
+
+        rule.compiled_regex = compiled_regex
+        rule.line_only = any(
+            _LINE_CONTEXT_RE.search(compiled.pattern.decode("utf-8"))
+            for compiled in compiled_regex
+        )
+        rule.union_regex = self._build_union_regex(compiled_regex)
+        rule.file_regex = self._build_file_regex(rule.file_patterns)
+
+    def _build_file_regex(self, file_patterns: List[str]) -> re.Pattern:
+        """Translate a rule's file patterns into one regex over relative paths"""
+        alternatives = []
+        for pattern in file_patterns:
+            if "/" in pattern:
+                # Path glob, matched at any directory depth ("**/" is implied)
+                if pattern.startswith("**/"):
+                    pattern = pattern[3:]
+                alternatives.append(r"(?:.*/)?" + _glob_to_regex(pattern) + r"\Z")
+            elif pattern.startswith("*") and not any(
+                char in pattern[1:] for char in _GLOB_CHARS
+            ):
+                # "*.ext": the path ends with the suffix
+                alternatives.append(r".*" + re.escape(pattern[1:]) + r"\Z")
+            elif any(char in pattern for char in _GLOB_CHARS):
+                # Other globs apply to the file name; no wildcard matches "/"
+                alternatives.append(
+                    r"(?:.*/)?" + _glob_segment_to_regex(pattern) + r"\Z"
+                )
+            else:
+                # Literal: the file name contains it (".env", "LICENSE", ".pem")
+                alternatives.append(r"(?:.*/)?[^/]*" + re.escape(pattern) + r"[^/]*\Z")
+
+        if not alternatives:
+            # A rule without file patterns applies to no file
+            return re.compile(r"(?!)")
+
+        return re.compile("|".join(f"(?:{a})" for a in alternatives))
+
+    def _build_union_regex(
+        self, compiled_patterns: List[re.Pattern]
+    ) -> Optional[re.Pattern]:
+        """Combine patterns into one alternation that finds lines with any match"""
+        if not compiled_patterns:
+            return None
+
+        alternatives = []
+        for compiled in compiled_patterns:
+            alternative = self._as_alternative(compiled.pattern.decode("utf-8"))
+            if alternative is None:
+                return None
+            alternatives.append(f"(?:{alternative})")
+
+        try:
+            return _compile_bytes("|".join(alternatives))
+        except re.error:
+            # e.g. the same group name used by two patterns; scan separately
+            return None
+
+    def _build_master_regex(self, rules: List[ComplianceRule]) -> Optional[re.Pattern]:
+        """Combine every rule's patterns into one pre-filter for whole files"""
+        alternatives = []
+        for rule in rules:
+            for compiled in rule.compiled_regex:
+                alternative = self._as_alternative(compiled.pattern.decode("utf-8"))
+                if alternative is None:
+                    return None
+                alternatives.append(f"(?:{alternative})")
+
+        if not alternatives:
+            return None
+
+        try:
+            return _compile_bytes("|".join(alternatives))
+        except re.error:
+            return None
+
+    @staticmethod
+    def _as_alternative(pattern: str) -> Optional[str]:
+        """Rewrite a pattern so it can be embedded in an alternation"""
+        if _BACKREFERENCE_RE.search(pattern) or _LINE_CONTEXT_RE.search(pattern):
+            return None
+        alternative = _GLOBAL_FLAGS_RE.sub(r"(?\1:", pattern, count=1)
+        if alternative != pattern:
+            alternative += ")"
+        return alternative
+
     def get_rules(self) -> List[ComplianceRule]:
         """Get all loaded rules"""
         return self.rules.copy()
@@ -60,52 +287,125 @@ class RuleEngine:
         """Get rules filtered by severity level"""
         return [rule for rule in self.rules if rule.severity == severity]
 
-    def match_file_pattern(self, file_path: Path, rule: ComplianceRule) -> bool:
+    def match_file_pattern(self, file_path: PurePath, rule: ComplianceRule) -> bool:
         """Check if file matches any of the rule's file patterns"""
-        file_path_str = str(file_path)
-
-        for pattern in rule.file_patterns:
-            if pattern.startswith("*"):
-                # Handle wildcard patterns
-                if file_path_str.endswith(pattern[1:]):
-                    return True
-            elif pattern.startswith("**/"):
-                # Handle recursive directory patterns
-                if pattern[3:] in file_path_str:
-                    return True
-            elif pattern in file_path_str:
-                return True
-            elif file_path.name == pattern:
-                return True
-
-        return False
+        if rule.file_regex is None:
+            # Rules built outside _load_rules() have not been compiled yet
+            self._compile_rule(rule)
+        assert rule.file_regex is not None
+
+        return rule.file_regex.match(file_path.as_posix()) is not None
+
+    def matches_by_name_only(self, rule: ComplianceRule) -> bool:
+        """Check if match_file_pattern depends only on a file's name for this rule"""
+        # Only patterns containing "/" look at directories
+        return all("/" not in pattern for pattern in rule.file_patterns)
+
+    def may_match(self, content: bytes) -> bool:
+        """Return False when no rule's regex patterns can match content"""
+        if self.master_regex is None:
+            return True
+        return self.master_regex.search(content) is not None
 
     def match_regex_patterns(
-        self, content: str, rule: ComplianceRule
+        self,
+        content: bytes | str,
+        rule: ComplianceRule,
+        line_index: Optional[LineIndex] = None,
     ) -> List[Dict[str, Any]]:
-        """Check content against regex patterns and return matches"""
+        """Check content (bytes, a memory-mapped file or text) against regex patterns
+
+        Patterns run over the UTF-8 encoded bytes, so outside ASCII they count
+        bytes, not characters: ".", "\\w", "\\b" and repeats such as ".{3}"
+        see a non-ASCII character as several non-word bytes, and IGNORECASE
+        folds ASCII letters only. A reported match is widened to whole
+        characters before it is decoded.
+        """
+        if rule.file_regex is None:
+            # Rules built outside _load_rules() have not been compiled yet
+            self._compile_rule(rule)
+        if not rule.compiled_regex:
+            # No patterns, or none of them compiled; already reported once
+            return []
+
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+        # Callers checking several rules against one file share the index
+        if line_index is None:
+            line_index = LineIndex(content)
+
+        found = list(self._iter_matches(content, rule))
+        locations = line_index.locate_all([line_start for _, line_start, _ in found])
+
         matches = []
-        lines = content.split("\n")
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern in rule.regex_patterns:
-                try:
-                    matches_found = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches_found:
-                        matches.append(
-                            {
-                                "line_number": line_num,
-                                "content": line.strip(),
-                                "match": match.group(),
-                                "start_pos": match.start(),
-                                "end_pos": match.end(),
-                            }
-                        )
-                except re.error as e:
-                    print(f"Invalid regex pattern {pattern}: {e}")
+        for (pattern_index, _, match), location in zip(found, locations):
+            line_num, line_start, line_end = location
+            matches.append(
+                {
+                    "line_number": line_num,
+                    "content": _decode_text(content[line_start:line_end]).strip(),
+                    "match": _match_text(match),
+                    "pattern": rule.compiled_regex[pattern_index].pattern.decode(
+                        "utf-8"
+                    ),
+                    "start_pos": match.start(),
+                    "end_pos": match.end(),
+                }
+            )
 
         return matches
 
+    def _iter_matches(self, content: bytes, rule: ComplianceRule):
+        """Yield (pattern_index, line_start, match), matching each line by itself"""
+        # Rules are written for single lines, so patterns run on each line by
+        # itself, as if it were the whole text. Whole-content searches, with
+        # the union when there is one, only find the next line with a match.
+        if rule.line_only:
+            finders = None
+        elif rule.union_regex is not None:
+            finders = [rule.union_regex]
+        else:
+            finders = rule.compiled_regex
+        upcoming = [finder.search(content) for finder in finders or ()]
+
+        pos = 0
+        while True:
+            if finders is None:
+                # Every line is a candidate
+                line_start = pos
+            else:
+                starts = [match.start() for match in upcoming if match is not None]
+                if not starts:
+                    return
+                line_start = content.rfind(b"\n", 0, min(starts)) + 1
+
+            line_end = content.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = len(content)
+            line = content[line_start:line_end]
+
+            # Each pattern runs on its own, so overlapping matches of two
+            # patterns are both reported
+            for pattern_index, compiled in enumerate(rule.compiled_regex):
+                for match in compiled.finditer(line):
+                    yield pattern_index, line_start, match
+
+            pos = line_end + 1
+            if pos > len(content):
+                return
+            if finders is not None:
+                # A match found earlier that starts past this line is still
+                # the next one
+                upcoming = [
+                    (
+                        match
+                        if match is None or match.start() >= pos
+                        else finder.search(content, pos)
+                    )
+                    for finder, match in zip(finders, upcoming)
+                ]
+
     def validate_rule(self, rule: ComplianceRule) -> List[str]:
         """Validate a rule and return any calidation errors"""
         errors = []
@@ -120,6 +420,7 @@ class RuleEngine:
         for pattern in rule.regex_patterns:
             try:
                 re.compile(pattern)
+                _compile_bytes(pattern)
             except re.error as e:
                 errors.append(f"Invalid regex pattern '{pattern}': {e}")
 
@@ -1,149 +1,560 @@
+import hashlib
+import json
+import mmap
 import os
-from pathlib import Path
-from typing import List, Set
-from ..models.compliance import ComplianceRule, ComplianceViolation
+import pickle
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from pathlib import Path, PurePath, PurePosixPath
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, cast
+from ..models.compliance import ComplianceRule, ViolationBuffer
 from ..models.repository import RepositoryInfo
-from .rule_engine import RuleEngine
+from ..utils.config import get_config
+from ..utils.file_utils import FileUtils
+from .cache import ScanCache
+from .rule_engine import LineIndex, RuleEngine
+from .source import ZipRepositorySource
+
+# A null byte within this many leading bytes marks a binary file
+_BINARY_SNIFF_BYTES = 8192
+
+# Bump whenever matching changes what a file reports, so cached results
+# from older versions are not reused
+_CACHE_VERSION = 2
+
+
+class FileEntry(NamedTuple):
+    """A file to scan, with the stat fields gathered while listing it"""
+
+    path: str  # relative to the repository root, "/"-separated
+    size: int
+    mtime: float
+    location: Optional[Path] = None  # on-disk path; None for archive members
+
+
+# Per-process scanner state, set once by _init_worker in each pool worker
+_worker_scanner: Optional["ComplianceScanner"] = None
+_worker_repo_info: Optional[RepositoryInfo] = None
+
+
+def _init_worker(scanner: "ComplianceScanner", repo_info: RepositoryInfo) -> None:
+    """Install the scanner and repository in a pool worker process"""
+    global _worker_scanner, _worker_repo_info
+    _worker_scanner = scanner
+    _worker_repo_info = repo_info
+
+
+def _scan_file_worker(file_entry: FileEntry) -> ViolationBuffer:
+    """Scan one file inside a pool worker process"""
+    assert _worker_scanner is not None and _worker_repo_info is not None
+    return _worker_scanner._scan_file(file_entry, _worker_repo_info)
 
 
 class ComplianceScanner:
     """Scans repository files for compliance violations"""
 
-    def __init__(self, rule_engine: RuleEngine):
+    def __init__(
+        self,
+        rule_engine: RuleEngine,
+        max_workers: Optional[int] = None,
+        max_scan_bytes: int = 10 * 1024 * 1024,
+        cache: Optional[ScanCache] = None,
+    ):
         self.rule_engine = rule_engine
-        self.excluded_dirs = {
-            ".git",
-            "node_modules",
-            "venv",
-            "__pycache__",
-            ".pytest_cache",
-            "build",
-            "dist",
-        }
-        self.excluded_files = {".DS_Store", "Thumbs.db"}
+        self.cache = cache
+        self.rules = rule_engine.get_rules()
+        # Rules whose file patterns only look at the file name are matched once
+        # per distinct name; the rest are checked against every path
+        self._name_only_rules = [
+            index
+            for index, rule in enumerate(self.rules)
+            if rule_engine.matches_by_name_only(rule)
+        ]
+        self._path_rules = [
+            index
+            for index, rule in enumerate(self.rules)
+            if not rule_engine.matches_by_name_only(rule)
+        ]
+        self._applicable_rules_cache: Dict[Tuple[str, str], List[int]] = {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Below this many files, starting worker processes costs more than it saves
+        self.parallel_min_files = 200
+        # Archive members decompressed ahead of the scanning threads, capped
+        # both in count and in total bytes held in memory
+        self.pipeline_queue_size = 256
+        self.pipeline_queue_bytes = 64 * 1024 * 1024
+        # Copied so add_excluded_* never changes the shared configuration
+        config = get_config()
+        self.excluded_dirs = set(config["excluded_dirs"])
+        self.excluded_files = set(config["excluded_files"])
+        # Content of larger files is not read; rules that only check
+        # for a file's presence still apply to them
+        self.max_scan_bytes = max_scan_bytes
+        # Known binary formats, skipped without reading their content
+        self.binary_extensions = config["binary_extensions"]
+
+    def __getstate__(self):
+        """Drop the cache when pickled for worker processes, which never use it"""
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
 
-    def scan_repository(self, repo_info: RepositoryInfo) -> List[ComplianceViolation]:
+    def scan_repository(self, repo_info: RepositoryInfo) -> ViolationBuffer:
         """Scan entire repository for compliance violations"""
         print(f"Scanning repository: {repo_info.name}")
 
-        all_violations = []
-        scanned_files = 0
+        if repo_info.source is not None:
+            files_to_scan = self._get_archive_files(repo_info.source)
+        else:
+            assert repo_info.local_path is not None
+            files_to_scan = self._get_files_to_scan(repo_info.local_path)
 
-        for file_path in self._get_files_to_scan(repo_info.local_path):
-            scanned_files += 1
-            violations = self._scan_file(file_path, repo_info)
+        if self.cache is not None:
+            results = self._scan_files_incremental(files_to_scan, repo_info)
+        else:
+            results = self._scan_files(files_to_scan, repo_info)
+
+        all_violations = ViolationBuffer()
+        for violations in results:
             all_violations.extend(violations)
 
-        print(f"Scanned {scanned_files} files, found {len(all_violations)} violations")
+        print(
+            f"Scanned {len(files_to_scan)} files, found {len(all_violations)} violations"
+        )
         return all_violations
 
-    def _get_files_to_scan(self, repo_path: Path) -> List[Path]:
-        """Get list of files to scan, excluding certain directories and files"""
+    def _scan_files_incremental(
+        self, files_to_scan: List[FileEntry], repo_info: RepositoryInfo
+    ) -> List[ViolationBuffer]:
+        """Reuse cached results for unchanged files and scan only the rest"""
+        cache = self.cache
+        assert cache is not None
+        rules_hash = self._results_fingerprint()
+        results: List[Optional[ViolationBuffer]] = []
+        digests: List[Optional[str]] = []
+
+        # The cache only saves work; if it fails, every file is scanned
+        try:
+            for file_entry in files_to_scan:
+                violations, digest = cache.lookup(
+                    repo_info.url,
+                    file_entry.path,
+                    file_entry.mtime,
+                    file_entry.size,
+                    rules_hash,
+                    lambda: self._file_digest(file_entry, repo_info),
+                    # Archive members share the commit time, at 2 s resolution,
+                    # so only their CRC shows a change
+                    trust_mtime=file_entry.location is not None,
+                )
+                results.append(violations)
+                digests.append(digest)
+        except sqlite3.Error as e:
+            print(f"Warning: Scan cache unavailable ({e}). All files will be scanned.")
+            self._discard_cache_writes()
+            return self._scan_files(files_to_scan, repo_info)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        print(f"Reusing cached results for {len(results) - len(pending)} files")
+
+        scanned = self._scan_files([files_to_scan[i] for i in pending], repo_info)
+
+        # Files on disk that still need a digest are hashed concurrently;
+        # files whose content is never read get a size-only digest instead
+        hashed = FileUtils.hash_files(
+            location
+            for index in pending
+            if digests[index] is None
+            and not self._skips_content(files_to_scan[index])
+            and (location := files_to_scan[index].location) is not None
+        )
+        for index, violations in zip(pending, scanned):
+            results[index] = violations
+            location = files_to_scan[index].location
+            if digests[index] is None and location is not None:
+                digests[index] = hashed.get(location)
+
+        try:
+            for index, violations in zip(pending, scanned):
+                file_entry = files_to_scan[index]
+                cache.store(
+                    repo_info.url,
+                    file_entry.path,
+                    file_entry.mtime,
+                    file_entry.size,
+                    rules_hash,
+                    digests[index] or self._file_digest(file_entry, repo_info),
+                    violations,
+                )
+            cache.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update scan cache: {e}")
+            self._discard_cache_writes()
+
+        # Every file now has a result, cached or freshly scanned
+        return cast(List[ViolationBuffer], results)
+
+    def _discard_cache_writes(self) -> None:
+        """Roll back the cache's pending writes after a failure"""
+        assert self.cache is not None
+        try:
+            self.cache.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _results_fingerprint(self) -> str:
+        """Fingerprint of the rules and every setting that changes a file's result"""
+        settings = {
+            "cache_version": _CACHE_VERSION,
+            "rules_hash": self.rule_engine.rules_hash,
+            "max_scan_bytes": self.max_scan_bytes,
+            "binary_extensions": sorted(self.binary_extensions),
+            "binary_sniff_bytes": _BINARY_SNIFF_BYTES,
+        }
+        return hashlib.sha256(
+            json.dumps(settings, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _scan_files(
+        self, files_to_scan: List[FileEntry], repo_info: RepositoryInfo
+    ) -> List[ViolationBuffer]:
+        """Scan files and return their violations in the same order"""
+        if self.max_workers > 1:
+            # An open archive cannot be shared with worker processes
+            if repo_info.source is not None:
+                return self._scan_files_pipelined(files_to_scan, repo_info)
+            if len(files_to_scan) >= self.parallel_min_files:
+                return self._scan_files_parallel(files_to_scan, repo_info)
+
+        return [self._scan_file(file_entry, repo_info) for file_entry in files_to_scan]
+
+    def _scan_files_pipelined(
+        self, files_to_scan: List[FileEntry], repo_info: RepositoryInfo
+    ) -> List[ViolationBuffer]:
+        """Decompress archive members on one thread while a thread pool scans them"""
+        source = repo_info.source
+        assert source is not None
+        results = [ViolationBuffer() for _ in files_to_scan]
+        # Bounded, so decompressed content never runs far ahead of the scanners
+        work: queue.Queue = queue.Queue(maxsize=self.pipeline_queue_size)
+        # Bytes decompressed but not yet scanned; a single member larger than
+        # the limit is still let through on its own
+        held = threading.Condition()
+        held_bytes = 0
+
+        def reserve(size: int) -> None:
+            nonlocal held_bytes
+            with held:
+                held.wait_for(
+                    lambda: held_bytes == 0
+                    or held_bytes + size <= self.pipeline_queue_bytes
+                )
+                held_bytes += size
+
+        def release(size: int) -> None:
+            nonlocal held_bytes
+            with held:
+                held_bytes -= size
+                held.notify()
+
+        def extract() -> None:
+            try:
+                for index, file_entry in enumerate(files_to_scan):
+                    size = 0
+                    try:
+                        rules = self._get_applicable_rules(
+                            PurePosixPath(file_entry.path)
+                        )
+                        content = None
+                        # Members that are never decompressed hold no bytes
+                        if any(
+                            rule.regex_patterns for rule in rules
+                        ) and not self._skips_content(file_entry):
+                            # Wait for room before decompressing the member
+                            size = file_entry.size
+                            reserve(size)
+                            content = self._read_archive_member(file_entry, source)
+                    except Exception as e:
+                        print(f"Error scanning file {file_entry.path}: {e}")
+                        release(size)
+                        continue
+                    work.put((index, rules, content, size))
+            finally:
+                for _ in range(self.max_workers):
+                    work.put(None)
+
+        def scan() -> None:
+            while (item := work.get()) is not None:
+                index, rules, content, size = item
+                relative_path = files_to_scan[index].path
+                try:
+                    results[index] = self._check_rules_against_content(
+                        relative_path, content, rules
+                    )
+                except Exception as e:
+                    print(f"Error scanning file {relative_path}: {e}")
+                finally:
+                    # Drop the content before making room for more
+                    del item, content
+                    release(size)
+
+        extractor = threading.Thread(target=extract, daemon=True)
+        extractor.start()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in range(self.max_workers):
+                executor.submit(scan)
+        extractor.join()
+
+        return results
+
+    def _scan_files_parallel(
+        self, files_to_scan: List[FileEntry], repo_info: RepositoryInfo
+    ) -> List[ViolationBuffer]:
+        """Scan files across worker processes, falling back to threads"""
+        chunksize = max(1, min(32, len(files_to_scan) // (self.max_workers * 4)))
+
+        try:
+            # Regex matching holds the GIL, so processes give real parallelism
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self, repo_info),
+            ) as executor:
+                return list(
+                    executor.map(_scan_file_worker, files_to_scan, chunksize=chunksize)
+                )
+        except (BrokenProcessPool, pickle.PicklingError, OSError) as e:
+            # e.g. rules that cannot be pickled for a spawned worker
+            print(f"Process pool unavailable ({e}), scanning with threads")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(
+                    executor.map(
+                        lambda file_entry: self._scan_file(file_entry, repo_info),
+                        files_to_scan,
+                    )
+                )
+
+    def _get_files_to_scan(self, repo_path: Path) -> List[FileEntry]:
+        """Get files to scan, excluding certain directories and files"""
         files_to_scan = []
+        root_length = len(os.path.join(str(repo_path), ""))
 
-        for root, dirs, files in os.walk(repo_path):
-            # Filter out excluded directories
-            dirs[:] = [
-                d for d in dirs if d not in self.excluded_dirs and not d.startswith(".")
-            ]
+        # Hidden files and directories are skipped along with the exclusions
+        for entry in FileUtils.walk_files(
+            repo_path, self.excluded_dirs, self.excluded_files, skip_hidden=True
+        ):
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            relative_path = entry.path[root_length:].replace(os.sep, "/")
+            files_to_scan.append(
+                FileEntry(relative_path, stat.st_size, stat.st_mtime, Path(entry.path))
+            )
+
+        return files_to_scan
 
-            for file in files:
-                if file not in self.excluded_files and not file.startswith("."):
-                    file_path = Path(root) / file
-                    files_to_scan.append(file_path)
+    def _get_archive_files(self, source: ZipRepositorySource) -> List[FileEntry]:
+        """Get archive members to scan, with the same exclusions as a directory walk"""
+        files_to_scan = []
+
+        for member in source.iter_files():
+            *dir_names, file_name = member.path.split("/")
+            if (
+                file_name in self.excluded_files
+                or file_name.startswith(".")
+                or any(
+                    name in self.excluded_dirs or name.startswith(".")
+                    for name in dir_names
+                )
+            ):
+                continue
+            files_to_scan.append(FileEntry(member.path, member.size, member.mtime))
 
         return files_to_scan
 
+    def _file_digest(self, file_entry: FileEntry, repo_info: RepositoryInfo) -> str:
+        """Return a content digest used to recognise unchanged files"""
+        # The result for a file that is never read depends only on its size
+        if self._skips_content(file_entry):
+            return f"skipped:{file_entry.size}"
+        if file_entry.location is None:
+            assert repo_info.source is not None
+            return repo_info.source.digest(file_entry.path)
+        return FileUtils.get_file_hash(file_entry.location)
+
     def _scan_file(
-        self, file_path: Path, repo_info: RepositoryInfo
-    ) -> List[ComplianceViolation]:
+        self, file_entry: FileEntry, repo_info: RepositoryInfo
+    ) -> ViolationBuffer:
         """Scan a single file for compliance violations"""
-        violations = []
+        violations = ViolationBuffer()
 
         try:
-            # check each rule against the file
-            for rule in self.rule_engine.get_rules():
-                rule_violations = self._check_rule_against_file(
-                    file_path, rule, repo_info
+            rules = self._get_applicable_rules(PurePosixPath(file_entry.path))
+
+            # Read the file once, and only if some rule inspects its content
+            if any(rule.regex_patterns for rule in rules):
+                with self._open_file_content(file_entry, repo_info) as content:
+                    violations = self._check_rules_against_content(
+                        file_entry.path, content, rules
+                    )
+            else:
+                violations = self._check_rules_against_content(
+                    file_entry.path, None, rules
                 )
-                violations.extend(rule_violations)
         except Exception as e:
-            print(f"Error scanning file {file_path}: {e}")
+            print(f"Error scanning file {file_entry.path}: {e}")
 
         return violations
 
-    def _check_rule_against_file(
-        self, file_path: Path, rule: ComplianceRule, repo_info: RepositoryInfo
-    ) -> List[ComplianceViolation]:
-        """Check if a specific rule is violated by a file"""
-        violations = []
+    def _check_rules_against_content(
+        self,
+        relative_path: str,
+        content: Optional[bytes],
+        rules: List[ComplianceRule],
+    ) -> ViolationBuffer:
+        """Check the applicable rules against a file's content (None if unread)"""
+        violations = ViolationBuffer()
 
-        # Check if file matches the rule's file patterns
-        if not self.rule_engine.match_file_pattern(file_path, rule):
-            return violations
+        # With several rules to run, one combined search can rule them all out
+        regex_rules = sum(1 for rule in rules if rule.regex_patterns)
+        if (
+            content is not None
+            and regex_rules > 1
+            and not self.rule_engine.may_match(content)
+        ):
+            content = None
 
-        try:
-            # Read file content
-            content = self._read_file_content(file_path)
-            if content is None:
-                return violations
+        # Line offsets are computed at most once, shared by every rule
+        line_index = LineIndex(content) if content is not None else None
+
+        # check each rule against the file
+        for rule in rules:
+            self._check_rule_against_file(
+                relative_path, content, line_index, rule, violations
+            )
 
+        return violations
+
+    def _get_applicable_rules(self, file_path: PurePath) -> List[ComplianceRule]:
+        """Get the rules whose file patterns match a repository-relative path"""
+        key = (file_path.suffix, file_path.name)
+        by_name = self._applicable_rules_cache.get(key)
+        if by_name is None:
+            by_name = [
+                index
+                for index in self._name_only_rules
+                if self.rule_engine.match_file_pattern(file_path, self.rules[index])
+            ]
+            self._applicable_rules_cache[key] = by_name
+
+        by_path = [
+            index
+            for index in self._path_rules
+            if self.rule_engine.match_file_pattern(file_path, self.rules[index])
+        ]
+
+        indices = sorted(by_name + by_path) if by_path else by_name
+        return [self.rules[index] for index in indices]
+
+    def _check_rule_against_file(
+        self,
+        relative_path: str,
+        content: Optional[bytes],
+        line_index: Optional[LineIndex],
+        rule: ComplianceRule,
+        violations: ViolationBuffer,
+    ) -> None:
+        """Record violations of a specific rule by a file matching its patterns"""
+        try:
             # Check regex patterns
-            regex_matches = self.rule_engine.match_regex_patterns(content, rule)
-
-            for match in regex_matches:
-                violation = ComplianceViolation(
-                    rule_id=rule.id,
-                    rule_title=rule.title,
-                    severity=rule.severity,
-                    file_path=repo_info.get_relative_path(file_path),
-                    line_number=match["line_number"],
-                    content=match["content"],
-                    description=rule.description,
-                    compliance_mapping=rule.compliance_mapping,
-                    fix_suggestion=rule.fix_suggestion,
-                    context=match.get("match", ""),
+            if rule.regex_patterns:
+                if content is None:
+                    return
+
+                regex_matches = self.rule_engine.match_regex_patterns(
+                    content, rule, line_index
                 )
-                violations.append(violation)
-
-            # For rules without regex patterns, check if file exists
-            if not rule.regex_patterns and rule.file_patterns:
-                if self.rule_engine.match_file_pattern(file_path, rule):
-                    violation = ComplianceViolation(
-                        rule_id=rule.id,
-                        rule_title=rule.title,
-                        severity=rule.severity,
-                        file_path=repo_info.get_relative_path(file_path),
-                        line_number=0,
-                        content="File found",
-                        description=rule.description,
-                        compliance_mapping=rule.compliance_mapping,
-                        fix_suggestion=rule.fix_suggestion,
+
+                for match in regex_matches:
+                    violations.append(
+                        rule,
+                        relative_path,
+                        match["line_number"],
+                        match["content"],
+                        match.get("match", ""),
                     )
-                    violations.append(violation)
+
+            # For rules without regex patterns, the file existing is the violation
+            else:
+                violations.append(rule, relative_path, 0, "File found")
 
         except Exception as e:
-            print(f"Error checking rule {rule.id} against file {file_path}: {e}")
+            print(f"Error checking rule {rule.id} against file {relative_path}: {e}")
 
-        return violations
+    @contextmanager
+    def _open_file_content(
+        self, file_entry: FileEntry, repo_info: RepositoryInfo
+    ) -> Iterator[Optional[bytes]]:
+        """Map or read a file's content for scanning, or yield None to skip it"""
+        if file_entry.location is None:
+            assert repo_info.source is not None
+            yield self._read_archive_member(file_entry, repo_info.source)
+            return
+
+        # Skip known binary formats and oversized files before opening them
+        if self._skips_content(file_entry):
+            yield None
+            return
 
-    def _read_file_content(self, file_path: Path) -> str | None:
-        """Read file content with proper encoding handling"""
         try:
-            # Try UTF-8 first
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        except UnicodeDecodeError:
-            try:
-                # Fall back to latin-1 for binary-like files
-                with open(file_path, "r", encoding="latin-1") as f:
-                    return f.read()
-            except Exception:
-                # Skip files that can't be read as text
-                return None
-        except Exception:
+            f = open(file_entry.location, "rb")
+        except OSError:
+            yield None
+            return
+
+        with f:
+            if file_entry.size == 0:
+                # Empty files cannot be mapped
+                yield b""
+            else:
+                try:
+                    # Pages are read lazily by the OS; no decoded copy is made
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    yield None
+                    return
+
+                with mapped as content:
+                    # A null byte near the start marks a binary file
+                    if content.find(b"\x00", 0, _BINARY_SNIFF_BYTES) != -1:
+                        yield None
+                    else:
+                        # A map supports every bytes operation the matcher uses
+                        yield cast(bytes, content)
+
+    def _read_archive_member(
+        self, file_entry: FileEntry, source: ZipRepositorySource
+    ) -> Optional[bytes]:
+        """Decompress an archive member for scanning, or return None to skip it"""
+        if self._skips_content(file_entry):
             return None
 
+        content = source.read(file_entry.path)
+        # A null byte near the start marks a binary file
+        if content.find(b"\x00", 0, _BINARY_SNIFF_BYTES) != -1:
+            return None
+        return content
+
+    def _skips_content(self, file_entry: FileEntry) -> bool:
+        """Whether a file is a known binary format or too large to scan"""
+        suffix = PurePosixPath(file_entry.path).suffix.lower()
+        return suffix in self.binary_extensions or file_entry.size > self.max_scan_bytes
+
     def add_excluded_directory(self, dir_name: str) -> None:
         """Add a directory to the exclusion list"""
         self.excluded_dirs.add(dir_name)
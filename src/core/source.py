@@ -0,0 +1,69 @@
+import time
+import zipfile
+from typing import IO, Dict, Iterator, List, NamedTuple
+
+
+class ArchiveMember(NamedTuple):
+    """A regular file inside a repository archive"""
+
+    path: str
+    size: int
+    mtime: float
+
+
+class ZipRepositorySource:
+    """Reads repository files straight out of a zip archive, without extracting it"""
+
+    def __init__(self, archive: IO[bytes]):
+        self.archive = archive
+        self.zip_file = zipfile.ZipFile(archive)
+        self._members: Dict[str, zipfile.ZipInfo] = {}
+
+        infos = [info for info in self.zip_file.infolist() if not info.is_dir()]
+        root = self._common_root(infos)
+        for info in infos:
+            self._members[info.filename[len(root) :]] = info
+
+    @staticmethod
+    def _common_root(infos: List[zipfile.ZipInfo]) -> str:
+        """Return the single top-level directory prefix shared by every member"""
+        if not infos:
+            return ""
+
+        root, sep, _ = infos[0].filename.partition("/")
+        if not sep:
+            return ""
+
+        prefix = root + "/"
+        if all(info.filename.startswith(prefix) for info in infos):
+            return prefix
+        return ""
+
+    @property
+    def size_bytes(self) -> int:
+        """Total uncompressed size of the repository files"""
+        return sum(info.file_size for info in self._members.values())
+
+    @property
+    def file_count(self) -> int:
+        """Number of files in the archive"""
+        return len(self._members)
+
+    def iter_files(self) -> Iterator[ArchiveMember]:
+        """Yield every file in the archive with its repository-relative path"""
+        for path, info in self._members.items():
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            yield ArchiveMember(path, info.file_size, mtime)
+
+    def read(self, path: str) -> bytes:
+        """Decompress and return the content of one file"""
+        return self.zip_file.read(self._members[path])
+
+    def digest(self, path: str) -> str:
+        """Return the content checksum stored in the archive, without reading the file"""
+        return f"crc32:{self._members[path].CRC:08x}"
+
+    def close(self) -> None:
+        """Release the archive"""
+        self.zip_file.close()
+        self.archive.close()
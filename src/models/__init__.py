@@ -1,9 +1,15 @@
-from .compliance import ComplianceRule, ComplianceViolation, ComplianceReport
+from .compliance import (
+    ComplianceRule,
+    ComplianceViolation,
+    ComplianceReport,
+    ViolationBuffer,
+)
 from .repository import RepositoryInfo
 
 __all__ = [
     "ComplianceRule",
     "ComplianceViolation",
     "ComplianceReport",
+    "ViolationBuffer",
     "RepositoryInfo",
 ]
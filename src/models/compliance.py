@@ -1,8 +1,21 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import heapq
+import re
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # optional; ViolationBuffer.top() falls back to heapq
+    np = None
 
-@dataclass
+# Severities from least to most severe, for ordering violations
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+@dataclass(slots=True)
 class ComplianceRule:
     """
     Represents a compliance rule with patterns and metadata
@@ -16,6 +29,14 @@ class ComplianceRule:
     severity: str
     compliance_mapping: List[str]
     fix_suggestion: str
+    # Compiled forms of the patterns, filled in by the RuleEngine
+    compiled_regex: List[re.Pattern] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    union_regex: Optional[re.Pattern] = field(default=None, repr=False, compare=False)
+    file_regex: Optional[re.Pattern] = field(default=None, repr=False, compare=False)
+    # Set when some pattern must be run on every line rather than searched for
+    line_only: bool = field(default=False, repr=False, compare=False)
 
     def __post_init__(self):
         """validate rule data after initialization"""
@@ -25,7 +46,7 @@ class ComplianceRule:
             raise ValueError("Severity must be low, medium, high, or critical")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ComplianceViolation:
     """
     Represents a specific compliance violation found in the repository
@@ -38,7 +59,7 @@ class ComplianceViolation:
     line_number: int
     content: str
     description: str
-    compliance_mapping: List[str]
+    compliance_mapping: Tuple[str, ...]
     fix_suggestion: str
     context: Optional[str] = None
 
@@ -46,9 +67,144 @@ class ComplianceViolation:
         """Validate violation data after initialization"""
         if not self.rule_id or not self.file_path:
             raise ValueError("Rule ID and file path are required")
+        # A tuple keeps violations hashable
+        object.__setattr__(self, "compliance_mapping", tuple(self.compliance_mapping))
+
+
+class ViolationBuffer(Sequence):
+    """
+    Violations stored column-wise, built into ComplianceViolation objects only on access
+    """
+
+    def __init__(self):
+        self.rule_ids: List[str] = []
+        self.severities: List[str] = []
+        self.severity_ranks = array("b")
+        self.file_paths: List[str] = []
+        self.line_numbers = array("i")
+        self.contents: List[str] = []
+        self.contexts: List[Optional[str]] = []
+        # Title, description, mappings and fix are stored once per rule
+        self.rule_fields: Dict[str, Tuple[str, str, Tuple[str, ...], str]] = {}
+
+    def append(
+        self,
+        rule: ComplianceRule,
+        file_path: str,
+        line_number: int,
+        content: str,
+        context: Optional[str] = None,
+    ) -> None:
+        """Record a violation of a rule"""
+        if rule.id not in self.rule_fields:
+            self.rule_fields[rule.id] = (
+                rule.title,
+                rule.description,
+                tuple(rule.compliance_mapping),
+                rule.fix_suggestion,
+            )
+        self._append_row(
+            rule.id, rule.severity, file_path, line_number, content, context
+        )
+
+    def add(self, violation: ComplianceViolation) -> None:
+        """Record an existing violation object"""
+        if violation.rule_id not in self.rule_fields:
+            self.rule_fields[violation.rule_id] = (
+                violation.rule_title,
+                violation.description,
+                violation.compliance_mapping,
+                violation.fix_suggestion,
+            )
+        self._append_row(
+            violation.rule_id,
+            violation.severity,
+            violation.file_path,
+            violation.line_number,
+            violation.content,
+            violation.context,
+        )
+
+    def extend(self, other: "ViolationBuffer") -> None:
+        """Append every violation of another buffer"""
+        for rule_id, fields in other.rule_fields.items():
+            self.rule_fields.setdefault(rule_id, fields)
+        self.rule_ids.extend(other.rule_ids)
+        self.severities.extend(other.severities)
+        self.severity_ranks.extend(other.severity_ranks)
+        self.file_paths.extend(other.file_paths)
+        self.line_numbers.extend(other.line_numbers)
+        self.contents.extend(other.contents)
+        self.contexts.extend(other.contexts)
 
+    def _append_row(
+        self,
+        rule_id: str,
+        severity: str,
+        file_path: str,
+        line_number: int,
+        content: str,
+        context: Optional[str],
+    ) -> None:
+        """Append one violation's per-match columns"""
+        self.rule_ids.append(rule_id)
+        self.severities.append(severity)
+        self.severity_ranks.append(SEVERITY_RANK.get(severity, -1))
+        self.file_paths.append(file_path)
+        self.line_numbers.append(line_number)
+        self.contents.append(content)
+        self.contexts.append(context)
 
-@dataclass
+    def __len__(self) -> int:
+        return len(self.rule_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        title, description, compliance_mapping, fix_suggestion = self.rule_fields[
+            self.rule_ids[index]
+        ]
+        return ComplianceViolation(
+            rule_id=self.rule_ids[index],
+            rule_title=title,
+            severity=self.severities[index],
+            file_path=self.file_paths[index],
+            line_number=self.line_numbers[index],
+            content=self.contents[index],
+            description=description,
+            compliance_mapping=compliance_mapping,
+            fix_suggestion=fix_suggestion,
+            context=self.contexts[index],
+        )
+
+    def severity_counts(self) -> Dict[str, int]:
+        """Count violations per severity, in order of first appearance"""
+        return dict(Counter(self.severities))
+
+    def top(self, n: int) -> List[ComplianceViolation]:
+        """Get the n most severe violations; ties keep their scan order"""
+        n = min(n, len(self))
+        if n <= 0:
+            return []
+
+        if np is None:
+            indices = heapq.nlargest(
+                n, range(len(self)), key=self.severity_ranks.__getitem__
+            )
+        else:
+            ranks = np.frombuffer(self.severity_ranks, dtype=np.int8)
+            # Select around the n-th highest rank without sorting everything
+            kth = np.partition(ranks, len(ranks) - n)[len(ranks) - n]
+            above = np.flatnonzero(ranks > kth)
+            ties = np.flatnonzero(ranks == kth)[: n - len(above)]
+            chosen = np.concatenate([above, ties])
+            indices = chosen[np.lexsort((chosen, -ranks[chosen].astype(np.int16)))]
+
+        return [self[int(index)] for index in indices]
+
+
+@dataclass(slots=True)
 class ComplianceReport:
     """
     Comprehensive compliance report for a repository
@@ -66,11 +222,27 @@ class ComplianceReport:
     compliance_score: float
     recommendations: List[str]
     scan_duration: float
+    _by_severity: Dict[str, List[ComplianceViolation]] = field(
+        init=False, repr=False, compare=False
+    )
+    _by_rule: Dict[str, List[ComplianceViolation]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        """Index violations by severity and rule in a single pass"""
+        by_severity = defaultdict(list)
+        by_rule = defaultdict(list)
+        for v in self.violations:
+            by_severity[v.severity].append(v)
+            by_rule[v.rule_id].append(v)
+        self._by_severity = dict(by_severity)
+        self._by_rule = dict(by_rule)
 
     def get_violations_by_severity(self, severity: str) -> List[ComplianceViolation]:
         """Get violations filtered by severity level"""
-        return [v for v in self.violations if v.severity == severity]
+        return list(self._by_severity.get(severity, ()))
 
     def get_violations_by_rule(self, rule_id: str) -> List[ComplianceViolation]:
         """Get violations filtered by rule ID"""
-        return [v for v in self.violations if v.rule_id == rule_id]
+        return list(self._by_rule.get(rule_id, ()))
@@ -1,22 +1,28 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from ..core.source import ZipRepositorySource
 
-@dataclass
+
+@dataclass(slots=True)
 class RepositoryInfo:
     """Information about a repository being analyzed"""
 
     url: str
     name: str
-    local_path: Path
+    local_path: Optional[Path]  # None when files are read from `source`
     branch: str
     commit_hash: Optional[str] = None
     size_bytes: Optional[int] = None
     file_count: Optional[int] = None
+    source: Optional["ZipRepositorySource"] = None
 
     def get_relative_path(self, file_path: Path) -> str:
         """Get relative path from repository root"""
+        if self.local_path is None:
+            return str(file_path)
         try:
             return str(file_path.relative_to(self.local_path))
         except ValueError:
@@ -1,4 +1,5 @@
 from .ai_analyzer import AIAnalyzer
+from .recommendation_cache import RecommendationCache
 from .report_generator import ReportGenerator
 
-__all__ = ["AIAnalyzer", "ReportGenerator"]
+__all__ = ["AIAnalyzer", "RecommendationCache", "ReportGenerator"]
@@ -1,15 +1,38 @@
 import os
-from typing import List, Optional
+import re
+import sqlite3
+from collections import Counter
+from typing import Dict, List, Optional
 from ..models.compliance import ComplianceViolation
 from ..utils.config import get_config
+from .recommendation_cache import RecommendationCache
+
+# A numbered or bulleted line; group 1 is the text after the numbering
+_BULLET_RE = re.compile(r"^\s*[0-9*-][0-9.* -]*(.*)$")
+
+_STATIC_PROMPT_PREFIX = """Based on the compliance violations found in a repository, listed under VIOLATIONS below:
+
+Please provide 5-7 actionable recommendations to improve the repository's security and compliance posture.
+Focus on:
+1. Immediate actions that can be taken
+2. Process improvements for the development team
+3. Tools and automation that should be implemented
+4. Training and awareness initiatives
+5. Long-term strategic improvements
+
+Format your response as a numbered list of specific, actionable recommendations.
+"""
 
 
 class AIAnalyzer:
     """Provides AI-Powered analysis and recommendations using Portia/Google Gemini"""
 
+    MODEL = "google/gemini-2.0-flash"
+
     def __init__(self):
         self.config = get_config()
         self.portia = self._initialize_portia()
+        self.cache = self._initialize_cache() if self.portia else None
 
     def _initialize_portia(self):
         """Initialize Portia for AI analysis"""
@@ -23,7 +46,7 @@ class AIAnalyzer:
 
             google_config = Config.from_default(
                 llm_provider=LLMProvider.GOOGLE,
-                default_model="google/gemini-2.0-flash",
+                default_model=self.MODEL,
                 google_api_key=google_api_key,
             )
             return Portia(config=google_config, tools=example_tool_registry)
@@ -34,6 +57,18 @@ class AIAnalyzer:
             print(f"Error initializing Portia: {e}")
             return None
 
+    def _initialize_cache(self) -> Optional[RecommendationCache]:
+        """Open the cache of AI recommendations, if enabled"""
+        cache_file = self.config["ai_cache_file"]
+        if not cache_file:
+            return None
+
+        try:
+            return RecommendationCache(cache_file, self.config["ai_cache_ttl_seconds"])
+        except Exception as e:
+            print(f"Warning: AI recommendation cache unavailable ({e}).")
+            return None
+
     def generate_recommendations(
         self, violations: List[ComplianceViolation]
     ) -> List[str]:
@@ -47,6 +82,11 @@ class AIAnalyzer:
 
             prompt = self._create_ai_prompt(violation_summary)
 
+            # Identical violation summaries get the same answer without a model call
+            cached = self._get_cached_recommendations(prompt)
+            if cached:
+                return cached
+
             plan_run = self.portia.run(prompt)
             result = plan_run.model_dump_json(indent=2)
 
@@ -56,77 +96,80 @@ class AIAnalyzer:
             if not recommendations:
                 return self._generate_fallback_recommendations(violations)
 
+            self._cache_recommendations(prompt, recommendations)
+
             return recommendations
         except Exception as e:
             print(f"Error generating AI recommendations: {e}")
             return self._generate_fallback_recommendations(violations)
 
+    def _get_cached_recommendations(self, prompt: str) -> Optional[List[str]]:
+        """Look up recommendations for a prompt; a failing cache is a miss"""
+        if self.cache is None:
+            return None
+
+        try:
+            return self.cache.get(self.MODEL, prompt)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read AI recommendation cache: {e}")
+            return None
+
+    def _cache_recommendations(self, prompt: str, recommendations: List[str]) -> None:
+        """Store recommendations for a prompt, if the cache allows it"""
+        if self.cache is None:
+            return
+
+        try:
+            self.cache.set(self.MODEL, prompt, recommendations)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update AI recommendation cache: {e}")
+
     def _create_violation_summary(self, violations: List[ComplianceViolation]) -> str:
         """Create a summary of violations for AI analysis"""
         if not violations:
             return "No violations found."
 
-        # Group violations by severity
-        # Group violations by severity
-        critical_violations = [v for v in violations if v.severity == "critical"]
-        high_violations     = [v for v in violations if v.severity == "high"]
-        medium_violations   = [v for v in violations if v.severity == "medium"]
-        low_violations      = [v for v in violations if v.severity == "low"]
-
-        summary  = f"Found {len(violations)} compliance violations:\n"
-        summary += f"- Critical severity: {len(critical_violations)}\n"
-        summary += f"- High severity: {len(high_violations)}\n"
-        summary += f"- Medium severity: {len(medium_violations)}\n"
-        summary += f"- Low severity: {len(low_violations)}\n\n"
-
-        # Add top violations by rule
-        rule_violations = {}
+        # Count by severity and by rule in a single pass
+        severity_counts: Counter[str] = Counter()
+        rule_counts: Counter[str] = Counter()
+        rule_titles: Dict[str, str] = {}
         for violation in violations:
-            if violation.rule_id not in rule_violations:
-                rule_violations[violation.rule_id] = []
-            rule_violations[violation.rule_id].append(violation)
-
+            severity_counts[violation.severity] += 1
+            rule_counts[violation.rule_id] += 1
+            rule_titles.setdefault(violation.rule_id, violation.rule_title)
+
+        summary = f"Found {len(violations)} compliance violations:\n"
+        summary += f"- Critical severity: {severity_counts['critical']}\n"
+        summary += f"- High severity: {severity_counts['high']}\n"
+        summary += f"- Medium severity: {severity_counts['medium']}\n"
+        summary += f"- Low severity: {severity_counts['low']}\n\n"
+
+        # Most frequent rules first, by ID on ties, so identical findings
+        # always produce an identical summary
         summary += "Top violations by rule:\n"
-        for rule_id, rule_violations_list in list(rule_violations.items())[:5]:
-            rule_title = rule_violations_list[0].rule_title
-            count = len(rule_violations_list)
-            summary += f"- {rule_title}: {count} violations\n"
+        top_rules = sorted(rule_counts.items(), key=lambda item: (-item[1], item[0]))
+        for rule_id, count in top_rules[:5]:
+            summary += f"- {rule_titles[rule_id]}: {count} violations\n"
 
         return summary
 
     def _create_ai_prompt(self, violation_summary: str) -> str:
         """Create AI prompt for analysis"""
-        return f"""
-        Based on these compliance violations found in a repository:
-        
-        {violation_summary}
-        
-        Please provide 5-7 actionable recommendations to improve the repository's security and compliance posture.
-        Focus on:
-        1. Immediate actions that can be taken
-        2. Process improvements for the development team
-        3. Tools and automation that should be implemented
-        4. Training and awareness initiatives
-        5. Long-term strategic improvements
-        
-        Format your response as a numbered list of specific, actionable recommendations.
-        """
+        # The unchanging instructions come first so repeated prompts share a
+        # prefix the model provider can cache; only the summary varies
+        return f"{_STATIC_PROMPT_PREFIX}\nVIOLATIONS:\n{violation_summary}"
 
     def _parse_ai_response(self, ai_response: str) -> List[str]:
         """Parse AI response and extract recommendations"""
         try:
             # This is a simplified parser - you might want to implement more sophisticated parsing
-            lines = ai_response.split("\n")
             recommendations = []
 
-            for line in lines:
-                line = line.strip()
-                if line and (
-                    line[0].isdigit() or line.startswith("-") or line.startswith("*")
-                ):
-                    # Remove numbering and clean up
-                    clean_line = line.lstrip("0123456789.-* ").strip()
-                    if clean_line and len(clean_line) > 10:
+            for match in map(_BULLET_RE.match, ai_response.split("\n")):
+                if match:
+                    # The numbering is already stripped by the pattern
+                    clean_line = match.group(1).strip()
+                    if len(clean_line) > 10:
                         recommendations.append(clean_line)
 
             return recommendations[:7]  # Limit to 7 recommendations
@@ -173,28 +216,22 @@ class AIAnalyzer:
             "common_patterns": [],
         }
 
-        # Analyze severity distribution
+        # Analyze severity, rule and file type distribution in one pass
+        severity_distribution: Counter[str] = Counter()
+        rule_distribution: Counter[str] = Counter()
+        file_type_distribution: Counter[str] = Counter()
         for violation in violations:
-            analysis["severity_distribution"][violation.severity] = (
-                analysis["severity_distribution"].get(violation.severity, 0) + 1
-            )
-
-        # Analyze rule distribution
-        for violation in violations:
-            analysis["rule_distribution"][violation.rule_id] = (
-                analysis["rule_distribution"].get(violation.rule_id, 0) + 1
-            )
-
-        # Analyze file type distribution
-        for violation in violations:
-            file_ext = (
-                violation.file_path.split(".")[-1]
-                if "." in violation.file_path
-                else "no_extension"
-            )
-            analysis["file_type_distribution"][file_ext] = (
-                analysis["file_type_distribution"].get(file_ext, 0) + 1
-            )
+            severity_distribution[violation.severity] += 1
+            rule_distribution[violation.rule_id] += 1
+            # Only the file name counts, and a leading dot (.gitignore) is
+            # not an extension
+            base_name = violation.file_path.rpartition("/")[2].lstrip(".")
+            file_ext = base_name.rpartition(".")[2] if "." in base_name else ""
+            file_type_distribution[file_ext or "no_extension"] += 1
+
+        analysis["severity_distribution"] = dict(severity_distribution)
+        analysis["rule_distribution"] = dict(rule_distribution)
+        analysis["file_type_distribution"] = dict(file_type_distribution)
 
         # Find common patterns
         high_frequency_rules = [
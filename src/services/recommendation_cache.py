@@ -0,0 +1,52 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+class RecommendationCache:
+    """Persists AI recommendations so identical prompts skip the model call"""
+
+    def __init__(self, db_path: str | Path, ttl_seconds: float):
+        self.db_path = Path(db_path).expanduser()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS recommendations (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                recommendations_json TEXT NOT NULL
+            )
+            """)
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Fingerprint a prompt for a given model"""
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[List[str]]:
+        """Return cached recommendations, or None if missing or expired"""
+        row = self.connection.execute(
+            "SELECT created_at, recommendations_json FROM recommendations "
+            "WHERE key = ?",
+            (self.make_key(model, prompt),),
+        ).fetchone()
+
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return json.loads(row[1])
+
+    def set(self, model: str, prompt: str, recommendations: List[str]) -> None:
+        """Store recommendations for a prompt"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO recommendations VALUES (?, ?, ?)",
+            (self.make_key(model, prompt), time.time(), json.dumps(recommendations)),
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self.connection.close()
@@ -1,11 +1,37 @@
 import json
 import time
+from collections import Counter
+from dataclasses import fields, is_dataclass
 from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Any
+from pathlib import Path, PurePath
+from typing import Dict, Iterator, List, TextIO
 from ..models.compliance import ComplianceReport, ComplianceViolation
 from ..models.repository import RepositoryInfo
 
+try:
+    import orjson
+except ImportError:  # optional; reports fall back to the stdlib json encoder
+    orjson = None  # type: ignore[assignment]
+
+# Score penalty per violation; unknown severities count as low
+_SEVERITY_WEIGHTS = {"low": 1, "medium": 2, "high": 3, "critical": 5}
+
+
+class ComplianceReportEncoder(json.JSONEncoder):
+    """JSON encoder for report dataclasses and paths"""
+
+    def default(self, o):
+        if is_dataclass(o) and not isinstance(o, type):
+            # Shallow, unlike asdict(); nested values are encoded in turn
+            return {
+                f.name: getattr(o, f.name)
+                for f in fields(o)
+                if not f.name.startswith("_")
+            }
+        if isinstance(o, PurePath):
+            return str(o)
+        return super().default(o)
+
 
 class ReportGenerator:
     """Generates comprehensive compliance reports in various formats"""
@@ -22,18 +48,19 @@ class ReportGenerator:
         scan_duration: float,
     ) -> ComplianceReport:
         """Generate a comprehensive compliance report"""
+        scan_time = datetime.now()
 
         # Count violations by severity
         severity_counts = self._count_violations_by_severity(violations)
 
-        # Calculate compliance score
-        compliance_score = self._calculate_compliance_score(violations)
+        # Calculate compliance score from the same counts
+        compliance_score = self._calculate_compliance_score(severity_counts)
 
         # Create report
         report = ComplianceReport(
             repository_url=repo_info.url,
             repository_name=repo_info.name,
-            scan_timestamp=datetime.now().isoformat(),
+            scan_timestamp=scan_time.isoformat(),
             total_violations=len(violations),
             high_severity=severity_counts.get("high", 0),
             medium_severity=severity_counts.get("medium", 0),
@@ -51,25 +78,18 @@ class ReportGenerator:
         self, violations: List[ComplianceViolation]
     ) -> Dict[str, int]:
         """Count violations grouped by severity"""
-        counts = {}
-        for violation in violations:
-            counts[violation.severity] = counts.get(violation.severity, 0) + 1
-        return counts
+        return dict(Counter(violation.severity for violation in violations))
 
-    def _calculate_compliance_score(
-        self, violations: List[ComplianceViolation]
-    ) -> float:
-        """Calculate overall compliance score (0-100)"""
-        if not violations:
+    def _calculate_compliance_score(self, severity_counts: Dict[str, int]) -> float:
+        """Calculate overall compliance score (0-100) from severity counts"""
+        if not severity_counts:
             return 100.0
 
         # Weight violations by severity
-        severity_weights = {"low": 1, "medium": 2, "high": 3, "critical": 5}
-        total_weight = 0
-
-        for violation in violations:
-            weight = severity_weights.get(violation.severity, 1)
-            total_weight += weight
+        total_weight = sum(
+            _SEVERITY_WEIGHTS.get(severity, 1) * count
+            for severity, count in severity_counts.items()
+        )
 
         # Calculate score (higher violations = lower score)
         # Assume worst case: all rules violated with high severity
@@ -78,21 +98,41 @@ class ReportGenerator:
 
         return round(score, 1)
 
+    @staticmethod
+    def file_timestamp(report: ComplianceReport) -> str:
+        """Format the report's scan time for use in file names"""
+        return datetime.fromisoformat(report.scan_timestamp).strftime("%Y%m%d_%H%M%S")
+
     def save_json_report(
         self, report: ComplianceReport, filename: str | None = None
     ) -> str:
         """Save report as JSON file"""
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self.file_timestamp(report)
             filename = f"compliance_report_{report.repository_name}_{timestamp}.json"
 
         filepath = self.output_dir / filename
 
-        # Convert dataclass to dict for JSON serialization
-        report_dict = self._report_to_dict(report)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report_dict, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # Dataclasses are serialized natively; the encoder handles paths
+            with open(filepath, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        report,
+                        default=ComplianceReportEncoder().default,
+                        option=orjson.OPT_INDENT_2,
+                    )
+                )
+        else:
+            # Violations are encoded one at a time as json.dump streams the file
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(
+                    report,
+                    f,
+                    cls=ComplianceReportEncoder,
+                    indent=2,
+                    ensure_ascii=False,
+                )
 
         print(f"JSON report saved to: {filepath}")
         return str(filepath)
@@ -102,110 +142,81 @@ class ReportGenerator:
     ) -> str:
         """Save report as Markdown file"""
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self.file_timestamp(report)
             filename = f"compliance_report_{report.repository_name}_{timestamp}.md"
 
         filepath = self.output_dir / filename
 
-        markdown_content = self._generate_markdown_content(report)
-
         with open(filepath, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
+            self._write_markdown(report, f)
 
         print(f"Markdown report saved to: {filepath}")
         return str(filepath)
 
-    def _report_to_dict(self, report: ComplianceReport) -> Dict[str, Any]:
-        """Convert ComplianceReport to dictionary for JSON serialization"""
-        return {
-            "repository_url": report.repository_url,
-            "repository_name": report.repository_name,
-            "scan_timestamp": report.scan_timestamp,
-            "total_violations": report.total_violations,
-            "high_severity": report.high_severity,
-            "medium_severity": report.medium_severity,
-            "low_severity": report.low_severity,
-            "critical_severity": report.critical_severity,
-            "compliance_score": report.compliance_score,
-            "scan_duration": report.scan_duration,
-            "violations": [
-                {
-                    "rule_id": v.rule_id,
-                    "rule_title": v.rule_title,
-                    "severity": v.severity,
-                    "file_path": v.file_path,
-                    "line_number": v.line_number,
-                    "content": v.content,
-                    "description": v.description,
-                    "compliance_mapping": v.compliance_mapping,
-                    "fix_suggestion": v.fix_suggestion,
-                    "context": v.context,
-                }
-                for v in report.violations
-            ],
-            "recommendations": report.recommendations,
-        }
-
-    def _generate_markdown_content(self, report: ComplianceReport) -> str:
-        """Generate Markdown content for the report"""
-        content = []
-
-        # Header
-        content.append(f"# Compliance Report: {report.repository_name}")
-        content.append("")
-        content.append(f"**Repository:** {report.repository_url}")
-        content.append(f"**Scan Date:** {report.scan_timestamp}")
-        content.append(f"**Scan Duration:** {report.scan_duration:.2f} seconds")
-        content.append("")
-
-        # Summary
-        content.append("## Executive Summary")
-        content.append("")
-        content.append(f"**Compliance Score:** {report.compliance_score}/100")
-        content.append(f"**Total Violations:** {report.total_violations}")
-        content.append(f"**High Severity:** {report.high_severity}")
-        content.append(f"**Medium Severity:** {report.medium_severity}")
-        content.append(f"**Low Severity:** {report.low_severity}")
-        content.append(f"**Critical Severity:** {report.critical_severity}")
-        content.append("")
+    def _write_markdown(self, report: ComplianceReport, f: TextIO) -> None:
+        """Write the report as Markdown, one block at a time"""
+        blocks = self._markdown_blocks(report)
+        f.write(next(blocks))
+        for block in blocks:
+            f.write("\n")
+            f.write(block)
+
+    def _markdown_blocks(self, report: ComplianceReport) -> Iterator[str]:
+        """Yield the Markdown report as newline-separated blocks"""
+        # Header and summary
+        yield (
+            f"# Compliance Report: {report.repository_name}\n"
+            f"\n"
+            f"**Repository:** {report.repository_url}\n"
+            f"**Scan Date:** {report.scan_timestamp}\n"
+            f"**Scan Duration:** {report.scan_duration:.2f} seconds\n"
+            f"\n"
+            f"## Executive Summary\n"
+            f"\n"
+            f"**Compliance Score:** {report.compliance_score}/100\n"
+            f"**Total Violations:** {report.total_violations}\n"
+            f"**High Severity:** {report.high_severity}\n"
+            f"**Medium Severity:** {report.medium_severity}\n"
+            f"**Low Severity:** {report.low_severity}\n"
+            f"**Critical Severity:** {report.critical_severity}\n"
+        )
 
         # Violations
         if report.violations:
-            content.append("## Violations Details")
-            content.append("")
+            yield "## Violations Details\n"
 
             for violation in report.violations:
-                content.append(f"### {violation.rule_id}: {violation.rule_title}")
-                content.append("")
-                content.append(f"**Severity:** {violation.severity}")
-                content.append(f"**File:** `{violation.file_path}`")
-                if violation.line_number > 0:
-                    content.append(f"**Line:** {violation.line_number}")
-                content.append(f"**Description:** {violation.description}")
-                content.append(
-                    f"**Compliance:** {', '.join(violation.compliance_mapping)}"
+                line = (
+                    f"**Line:** {violation.line_number}\n"
+                    if violation.line_number > 0
+                    else ""
+                )
+                yield (
+                    f"### {violation.rule_id}: {violation.rule_title}\n"
+                    f"\n"
+                    f"**Severity:** {violation.severity}\n"
+                    f"**File:** `{violation.file_path}`\n"
+                    f"{line}"
+                    f"**Description:** {violation.description}\n"
+                    f"**Compliance:** {', '.join(violation.compliance_mapping)}\n"
+                    f"\n"
+                    f"**Content:**\n"
+                    f"```\n"
+                    f"{violation.content}\n"
+                    f"```\n"
+                    f"\n"
+                    f"**Fix Suggestion:**\n"
+                    f"{violation.fix_suggestion}\n"
+                    f"\n"
+                    f"---\n"
                 )
-                content.append("")
-                content.append("**Content:**")
-                content.append(f"```")
-                content.append(violation.content)
-                content.append(f"```")
-                content.append("")
-                content.append("**Fix Suggestion:**")
-                content.append(f"{violation.fix_suggestion}")
-                content.append("")
-                content.append("---")
-                content.append("")
 
         # Recommendations
         if report.recommendations:
-            content.append("## Recommendations")
-            content.append("")
-            for i, rec in enumerate(report.recommendations, 1):
-                content.append(f"{i}. {rec}")
-            content.append("")
-
-        return "\n".join(content)
+            numbered = "\n".join(
+                f"{i}. {rec}" for i, rec in enumerate(report.recommendations, 1)
+            )
+            yield f"## Recommendations\n\n{numbered}\n"
 
     def print_console_report(self, report: ComplianceReport):
         """Print formatted report to console"""
@@ -1,6 +1,8 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 
 def load_env():
@@ -15,40 +17,98 @@ def load_env():
         )
 
 
-def get_config() -> Dict[str, Any]:
-    """Get configuration settings"""
+@lru_cache(maxsize=1)
+def get_config() -> Mapping[str, Any]:
+    """Get configuration settings, built once per process on first use"""
+    # Built lazily rather than at import so load_env() can run first
     config = {
         "rules_file": "config/rules.json",
         "output_dir": "reports",
-        "excluded_dirs": [".git", "node_modules", "venv", "__pycache__"],
-        "excluded_files": [".DS_Store", "Thumbs.db"],
+        # Sets, since they are tested for membership once per scanned entry
+        "excluded_dirs": frozenset(
+            {
+                ".git",
+                "node_modules",
+                "venv",
+                "__pycache__",
+                ".pytest_cache",
+                "build",
+                "dist",
+            }
+        ),
+        "excluded_files": frozenset({".DS_Store", "Thumbs.db"}),
+        # File types whose content is never scanned
+        "binary_extensions": frozenset(
+            {
+                ".png",
+                ".jpg",
+                ".jpeg",
+                ".gif",
+                ".bmp",
+                ".ico",
+                ".pdf",
+                ".zip",
+                ".gz",
+                ".tgz",
+                ".tar",
+                ".jar",
+                ".class",
+                ".pyc",
+                ".so",
+                ".dll",
+                ".exe",
+                ".woff",
+                ".woff2",
+                ".ttf",
+                ".eot",
+                ".mp3",
+                ".mp4",
+                ".mov",
+            }
+        ),
         "max_file_size_mb": 10,  # Skip files larger than this
-        "supported_extensions": [
-            ".py",
-            ".js",
-            ".jsx",
-            ".ts",
-            ".tsx",
-            ".java",
-            ".cpp",
-            ".c",
-            ".h",
-            ".yml",
-            ".yaml",
-            ".json",
-            ".xml",
-            ".html",
-            ".css",
-        ],
+        "supported_extensions": frozenset(
+            {
+                ".py",
+                ".js",
+                ".jsx",
+                ".ts",
+                ".tsx",
+                ".java",
+                ".cpp",
+                ".c",
+                ".h",
+                ".yml",
+                ".yaml",
+                ".json",
+                ".xml",
+                ".html",
+                ".css",
+            }
+        ),
         "ai_enabled": bool(os.getenv("GOOGLE_API_KEY")),
+        # AI recommendations reused for identical violation summaries;
+        # set to None to always query the model
+        "ai_cache_file": str(
+            Path.home() / ".compliance_cache" / "ai_recommendations.db"
+        ),
+        "ai_cache_ttl_seconds": 7 * 24 * 60 * 60,
         "scan_timeout_seconds": 300,  # 5 minutes
+        "scan_workers": None,  # None uses one worker per CPU
+        # Per-file results reused across runs; set to None to always rescan
+        "scan_cache_file": str(Path.home() / ".compliance_cache" / "scan_cache.db"),
+        # Shallow clones kept between runs so later scans only fetch changes;
+        # set to None to always download the archive instead
+        "clone_cache_dir": str(Path.home() / ".compliance_cache"),
     }
 
-    return config
+    # Shared by every caller, so it is read-only
+    return MappingProxyType(config)
 
 
+@lru_cache(maxsize=1)
 def get_rules_file_path() -> Path:
-    """Get the path to the rules file"""
+    """Get the path to the rules file, probed once per process"""
     config = get_config()
     rules_path = Path(config["rules_file"])
 
@@ -1,7 +1,94 @@
 import os
 import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Container, Dict, Iterable, Iterator, List, Optional
+
+# Read size for hashing when hashlib.file_digest is unavailable
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+# Printable ASCII, common whitespace controls, and non-ASCII bytes (UTF-8)
+_TEXT_BYTES = bytes(range(32, 127)) + b"\n\r\t\f\b" + bytes(range(128, 256))
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a glob pattern into a regex over "/"-separated relative paths"""
+    segments = pattern.split("/")
+    regex = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            # Any number of directories; at the end, any file below them
+            regex.append("(?:[^/]+/)*" + ("[^/]+" if last else ""))
+        else:
+            regex.append(_glob_segment_to_regex(segment) + ("" if last else "/"))
+    return "(?:" + "".join(regex) + ")"
+
+
+def _glob_segment_to_regex(segment: str) -> str:
+    """Translate one segment of a glob; its wildcards never match a slash"""
+    regex = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        i += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            # "]" right after "[" or "[!" is a literal member of the set
+            start = i + 1 if segment[i : i + 1] == "!" else i
+            end = segment.find("]", start + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+                continue
+            members = segment[i:end]
+            i = end + 1
+            negated = members.startswith("!")
+            if negated:
+                members = members[1:]
+            members = _glob_set_to_regex(members)
+            if not members:
+                # Every range was empty, as in "[z-a]"
+                regex.append("[^/]" if negated else "(?!)")
+            elif negated:
+                # A negated set must still not match the separator
+                regex.append(f"[^/{members}]")
+            elif "-" in members:
+                # A range such as "+-0" can span the separator
+                regex.append(f"(?!/)[{members}]")
+            else:
+                regex.append(f"[{members}]")
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _glob_set_to_regex(members: str) -> str:
+    """Translate the members of a glob set, dropping empty ranges like fnmatch"""
+    # A "-" first or last in the set is literal; any other one starts a range
+    chunks = []
+    start = 0
+    hyphen = members.find("-", 1)
+    while hyphen != -1:
+        chunks.append(members[start:hyphen])
+        start = hyphen + 1
+        hyphen = members.find("-", hyphen + 3)
+    if members[start:]:
+        chunks.append(members[start:])
+    else:
+        chunks[-1] += "-"
+
+    # A reversed range such as "z-a" matches nothing and is invalid in a regex
+    for k in range(len(chunks) - 1, 0, -1):
+        if chunks[k - 1][-1] > chunks[k][0]:
+            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+            del chunks[k]
+
+    # Escape everything special inside a regex set, "]", "^" and "-" included
+    return "-".join(re.sub(r"([\\\[\]^&~|-])", r"\\\1", chunk) for chunk in chunks)
 
 
 class FileUtils:
@@ -12,15 +99,36 @@ class FileUtils:
         """Calculate SHA256 hash of a file"""
         try:
             with open(file_path, "rb") as f:
+                if hasattr(hashlib, "file_digest"):
+                    # Python 3.11+: the read loop runs in C without the GIL
+                    return hashlib.file_digest(f, "sha256").hexdigest()
+
                 file_hash = hashlib.sha256()
-                chunk = f.read(8192)
-                while chunk:
-                    file_hash.update(chunk)
-                    chunk = f.read(8192)
+                buffer = memoryview(bytearray(_HASH_CHUNK_BYTES))
+                while size := f.readinto(buffer):
+                    file_hash.update(buffer[:size])
             return file_hash.hexdigest()
         except Exception:
             return ""
 
+    @staticmethod
+    def hash_files(
+        file_paths: Iterable[Path], max_workers: Optional[int] = None
+    ) -> Dict[Path, str]:
+        """Calculate SHA256 hashes of many files concurrently"""
+        file_paths = list(file_paths)
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+
+        if len(file_paths) < 2 or max_workers <= 1:
+            return {path: FileUtils.get_file_hash(path) for path in file_paths}
+
+        # File reads and SHA-256 over large buffers both release the GIL
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(
+                zip(file_paths, executor.map(FileUtils.get_file_hash, file_paths))
+            )
+
     @staticmethod
     def is_text_file(file_path: Path) -> bool:
         """Check if file is likely a text file"""
@@ -63,11 +171,15 @@ class FileUtils:
             # Check file content (first 1024 bytes)
             with open(file_path, "rb") as f:
                 chunk = f.read(1024)
-                try:
-                    chunk.decode("utf-8")
-                    return True
-                except UnicodeDecodeError:
-                    return False
+
+            if not chunk:
+                return True
+            if b"\x00" in chunk:
+                return False
+
+            # Deleting every text byte leaves the control characters behind
+            control = chunk.translate(None, _TEXT_BYTES)
+            return len(control) / len(chunk) < 0.30
 
         except Exception:
             return False
@@ -81,10 +193,18 @@ class FileUtils:
             return 0.0
 
     @staticmethod
-    def should_skip_file(file_path: Path, max_size_mb: float = 10.0) -> bool:
+    def should_skip_file(
+        file_path: Path, max_size_mb: float = 10.0, file_size: Optional[int] = None
+    ) -> bool:
         """Determine if a file should be skipped during scanning"""
-        # Skip files that are too large
-        if FileUtils.get_file_size_mb(file_path) > max_size_mb:
+        # Skip files that are too large; a size from a directory walk's
+        # DirEntry.stat() saves the stat call here
+        if file_size is None:
+            try:
+                file_size = file_path.stat().st_size
+            except OSError:
+                file_size = 0
+        if file_size > max_size_mb * 1024 * 1024:
             return True
 
         # Skip binary files
@@ -93,14 +213,83 @@ class FileUtils:
 
         return False
 
+    @staticmethod
+    def walk_files(
+        directory: Path | str,
+        excluded_dirs: Container[str] = (),
+        excluded_files: Container[str] = (),
+        skip_hidden: bool = False,
+    ) -> Iterator[os.DirEntry]:
+        """Recursively yield regular files as DirEntry objects via os.scandir"""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if skip_hidden and entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            yield from FileUtils.walk_files(
+                                entry.path, excluded_dirs, excluded_files, skip_hidden
+                            )
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name not in excluded_files:
+                            yield entry
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            return
+
     @staticmethod
     def find_files_by_pattern(directory: Path, pattern: str) -> List[Path]:
         """Find files matching a pattern in directory"""
         try:
-            return list(directory.glob(pattern))
+            return list(FileUtils.iter_files_by_patterns(directory, [pattern]))
         except Exception:
             return []
 
+    @staticmethod
+    def iter_files_by_patterns(
+        directory: Path, patterns: Iterable[str]
+    ) -> Iterator[Path]:
+        """Lazily yield files matching any of several glob patterns in one walk"""
+        patterns = [pattern.strip("/") for pattern in patterns]
+        if not patterns:
+            return
+
+        regex = re.compile("|".join(_glob_to_regex(pattern) for pattern in patterns))
+        # Without "**", no match can be deeper than the patterns' own segments
+        if any("**" in pattern for pattern in patterns):
+            max_depth = None
+        else:
+            max_depth = max(pattern.count("/") for pattern in patterns)
+
+        yield from FileUtils._iter_matching_files(directory, "", regex, max_depth)
+
+    @staticmethod
+    def _iter_matching_files(
+        directory: Path | str,
+        prefix: str,
+        regex: re.Pattern,
+        max_depth: Optional[int],
+    ) -> Iterator[Path]:
+        """Walk with os.scandir, yielding files whose relative path matches"""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative_path = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if max_depth is None or max_depth > 0:
+                            yield from FileUtils._iter_matching_files(
+                                entry.path,
+                                relative_path + "/",
+                                regex,
+                                None if max_depth is None else max_depth - 1,
+                            )
+                    elif entry.is_file(follow_symlinks=False):
+                        if regex.fullmatch(relative_path):
+                            yield Path(entry.path)
+        except OSError:
+            return
+
     @staticmethod
     def get_relative_path(file_path: Path, base_path: Path) -> str:
         """Get relative path from base path"""
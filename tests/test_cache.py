@@ -0,0 +1,243 @@
+import os
+import pytest
+import sqlite3
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.core.cache import ScanCache
+from ..src.core.rule_engine import RuleEngine
+from ..src.core import scanner as scanner_module
+from ..src.core.scanner import ComplianceScanner
+from ..src.models.compliance import ComplianceViolation, ViolationBuffer
+from ..src.models.repository import RepositoryInfo
+from ..src.utils.file_utils import FileUtils
+
+
+def make_violations() -> ViolationBuffer:
+    """Build a small set of violations to cache"""
+    violations = ViolationBuffer()
+    violations.add(
+        ComplianceViolation(
+            rule_id="TEST001",
+            rule_title="Test Rule",
+            severity="high",
+            file_path="src/app.py",
+            line_number=3,
+            content='password = "x"',
+            description="Test description",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+            context="password =",
+        )
+    )
+    return violations
+
+
+def no_digest() -> str:
+    """Digest callback for lookups that must not read the file"""
+    raise AssertionError("digest should not be computed")
+
+
+class TestScanCache:
+    """Test cases for ScanCache class"""
+
+    def test_store_and_lookup(self, tmp_path):
+        """Test stored results come back for an unchanged file"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+        cache.commit()
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 100.0, 42, "rules", no_digest
+        )
+
+        assert list(violations) == list(make_violations())
+        assert digest is None
+        cache.close()
+
+    def test_changed_mtime_with_same_digest_hits(self, tmp_path):
+        """Test a touched but unchanged file is recognised by its digest"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 200.0, 42, "rules", lambda: "d1"
+        )
+        assert list(violations) == list(make_violations())
+        assert digest == "d1"
+
+        # The new mtime is recorded on commit, so the next lookup skips the digest
+        cache.commit()
+        violations, _ = cache.lookup(
+            "repo", "src/app.py", 200.0, 42, "rules", no_digest
+        )
+        assert violations is not None
+        cache.close()
+
+    def test_changed_content_misses(self, tmp_path):
+        """Test a file with a different digest is rescanned"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 200.0, 42, "rules", lambda: "d2"
+        )
+
+        assert violations is None
+        assert digest == "d2"
+        cache.close()
+
+    def test_changed_rules_hash_misses(self, tmp_path):
+        """Test results cached under other rules are not reused"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+
+        violations, _ = cache.lookup(
+            "repo", "src/app.py", 100.0, 42, "other rules", no_digest
+        )
+
+        assert violations is None
+        cache.close()
+
+    def test_scanner_settings_change_the_cache_key(self, monkeypatch):
+        """Test scanner settings that change results are part of the cache key"""
+        engine = RuleEngine("config/rules.json")
+        scanner = ComplianceScanner(engine)
+        fingerprint = scanner._results_fingerprint()
+
+        assert fingerprint != engine.rules_hash
+        assert ComplianceScanner(engine)._results_fingerprint() == fingerprint
+        assert (
+            ComplianceScanner(engine, max_scan_bytes=1024)._results_fingerprint()
+            != fingerprint
+        )
+
+        monkeypatch.setattr(scanner_module, "_CACHE_VERSION", -1)
+        assert scanner._results_fingerprint() != fingerprint
+        monkeypatch.undo()
+
+        scanner.binary_extensions = scanner.binary_extensions | {".txt"}
+        assert scanner._results_fingerprint() != fingerprint
+
+    def test_oversized_files_are_not_hashed(self, tmp_path, monkeypatch):
+        """Test files too large to scan are cached by size without being read"""
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        (repo_path / "app.py").write_text('password = "secret123"\n')
+        (repo_path / "big.js").write_text("x" * 4096)
+        repo_info = RepositoryInfo("repo", "repo", repo_path, "main")
+
+        hashed = []
+        get_file_hash = FileUtils.get_file_hash
+
+        def record_hash(file_path):
+            hashed.append(Path(file_path).name)
+            return get_file_hash(file_path)
+
+        monkeypatch.setattr(FileUtils, "get_file_hash", staticmethod(record_hash))
+
+        cache = ScanCache(tmp_path / "cache.db")
+        scanner = ComplianceScanner(
+            RuleEngine("config/rules.json"),
+            max_workers=1,
+            max_scan_bytes=1024,
+            cache=cache,
+        )
+        first = list(scanner.scan_repository(repo_info))
+        assert "big.js" not in hashed
+
+        # A new mtime with the same size is still a cache hit
+        big_file = repo_path / "big.js"
+        stat = big_file.stat()
+        os.utime(big_file, (stat.st_atime, stat.st_mtime + 10))
+        hashed.clear()
+
+        assert list(scanner.scan_repository(repo_info)) == first
+        assert hashed == []
+        cache.close()
+
+    def test_lookup_does_not_hold_the_write_lock(self, tmp_path):
+        """Test a digest hit leaves the database writable by other processes"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+        cache.commit()
+
+        violations, _ = cache.lookup(
+            "repo", "src/app.py", 200.0, 42, "rules", lambda: "d1"
+        )
+        assert violations is not None
+
+        other = sqlite3.connect(str(tmp_path / "cache.db"), timeout=0)
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+        other.close()
+        cache.close()
+
+    @pytest.mark.parametrize("lock", ["EXCLUSIVE", "IMMEDIATE"])
+    def test_locked_cache_falls_back_to_scanning(self, tmp_path, lock):
+        """Test a scan still completes while another process locks the cache"""
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+        (repo_path / "app.py").write_text('print("password is", password)\n')
+        repo_info = RepositoryInfo("repo", "repo", repo_path, "main")
+        engine = RuleEngine("config/rules.json")
+        expected = list(
+            ComplianceScanner(engine, max_workers=1).scan_repository(repo_info)
+        )
+
+        cache = ScanCache(tmp_path / "cache.db", timeout=0.01)
+        other = sqlite3.connect(str(tmp_path / "cache.db"), timeout=0)
+        other.execute(f"BEGIN {lock}")
+
+        scanner = ComplianceScanner(engine, max_workers=1, cache=cache)
+        assert list(scanner.scan_repository(repo_info)) == expected
+
+        # Once the lock is released the cache is usable again
+        other.rollback()
+        other.close()
+        assert list(scanner.scan_repository(repo_info)) == expected
+        cache.close()
+
+    @pytest.mark.parametrize(
+        "violations_json", ["not json", '[{"rule_id": "TEST001"}]', '[{"old": 1}]']
+    )
+    def test_unreadable_rows_miss(self, tmp_path, violations_json):
+        """Test a corrupt or outdated row is rescanned instead of failing"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+        cache.connection.execute(
+            "UPDATE scan_results SET violations_json = ?", (violations_json,)
+        )
+
+        violations, _ = cache.lookup(
+            "repo", "src/app.py", 100.0, 42, "rules", no_digest
+        )
+        assert violations is None
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 200.0, 42, "rules", lambda: "d1"
+        )
+        assert violations is None
+        assert digest == "d1"
+        cache.close()
+
+    def test_untrusted_mtime_always_compares_digest(self, tmp_path):
+        """Test a same-mtime file is rechecked by digest when mtimes are unreliable"""
+        cache = ScanCache(tmp_path / "cache.db")
+        cache.store("repo", "src/app.py", 100.0, 42, "rules", "d1", make_violations())
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 100.0, 42, "rules", lambda: "d2", trust_mtime=False
+        )
+        assert violations is None
+        assert digest == "d2"
+
+        violations, digest = cache.lookup(
+            "repo", "src/app.py", 100.0, 42, "rules", lambda: "d1", trust_mtime=False
+        )
+        assert list(violations) == list(make_violations())
+        assert digest == "d1"
+        cache.close()
@@ -0,0 +1,122 @@
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.models import compliance
+from ..src.models.compliance import ComplianceRule, ComplianceViolation, ViolationBuffer
+
+SEVERITIES = ["low", "high", "medium", "high", "critical", "low", "medium", "high"]
+
+
+def make_rule(severity: str) -> ComplianceRule:
+    """Build a rule of the given severity"""
+    return ComplianceRule(
+        id=f"TEST_{severity}",
+        title="Test Rule",
+        description="Test description",
+        file_patterns=["*.py"],
+        regex_patterns=[],
+        severity=severity,
+        compliance_mapping=["TEST"],
+        fix_suggestion="Fix this",
+    )
+
+
+def make_buffer(severities=SEVERITIES) -> ViolationBuffer:
+    """Build a buffer with one violation per severity, on consecutive lines"""
+    violations = ViolationBuffer()
+    for line_number, severity in enumerate(severities, 1):
+        violations.append(make_rule(severity), "src/app.py", line_number, "content")
+    return violations
+
+
+@pytest.fixture(params=["numpy", "heapq"])
+def selection(request, monkeypatch):
+    """Run a test with each of ViolationBuffer.top()'s selection strategies"""
+    if request.param == "numpy":
+        if compliance.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(compliance, "np", None)
+    return request.param
+
+
+def make_violation(**overrides) -> ComplianceViolation:
+    """Build a violation, with fields overridden as needed"""
+    data = {
+        "rule_id": "TEST001",
+        "rule_title": "Test Rule",
+        "severity": "high",
+        "file_path": "src/app.py",
+        "line_number": 1,
+        "content": "content",
+        "description": "Test description",
+        "compliance_mapping": ["TEST"],
+        "fix_suggestion": "Fix this",
+    }
+    data.update(overrides)
+    return ComplianceViolation(**data)
+
+
+class TestComplianceViolation:
+    """Test cases for ComplianceViolation class"""
+
+    def test_violations_are_hashable(self):
+        """Test equal violations hash alike, so they can be deduplicated"""
+        violations = {make_violation(), make_violation(), make_violation(line_number=2)}
+
+        assert len(violations) == 2
+        assert make_violation().compliance_mapping == ("TEST",)
+
+
+class TestViolationBuffer:
+    """Test cases for ViolationBuffer class"""
+
+    def test_items_materialize_violations(self):
+        """Test stored rows come back as violations carrying their rule's fields"""
+        violations = make_buffer()
+
+        assert len(violations) == len(SEVERITIES)
+        assert [v.severity for v in violations] == SEVERITIES
+        assert violations[1].rule_id == "TEST_high"
+        assert violations[1].line_number == 2
+        assert violations[-1].description == "Test description"
+        assert [v.line_number for v in violations[2:4]] == [3, 4]
+
+    def test_top_orders_by_severity_then_scan_order(self, selection):
+        """Test the most severe violations come first, ties in scan order"""
+        violations = make_buffer()
+
+        assert [v.line_number for v in violations.top(4)] == [5, 2, 4, 8]
+        # Ties at the cut-off keep the earliest violations
+        assert [v.line_number for v in violations.top(3)] == [5, 2, 4]
+        assert violations.top(0) == []
+
+    def test_top_with_n_larger_than_buffer(self, selection):
+        """Test asking for more violations than exist returns all of them, ordered"""
+        violations = make_buffer()
+
+        assert [v.line_number for v in violations.top(100)] == [5, 2, 4, 8, 3, 7, 1, 6]
+        assert ViolationBuffer().top(5) == []
+
+    def test_extend(self):
+        """Test extending appends another buffer's violations in order"""
+        violations = make_buffer(["low", "high"])
+        violations.extend(make_buffer(["critical", "high"]))
+
+        assert [v.severity for v in violations] == ["low", "high", "critical", "high"]
+        assert [v.line_number for v in violations] == [1, 2, 1, 2]
+        assert violations[2].rule_id == "TEST_critical"
+
+    def test_severity_counts(self):
+        """Test counts per severity, in order of first appearance"""
+        assert make_buffer().severity_counts() == {
+            "low": 2,
+            "high": 3,
+            "medium": 2,
+            "critical": 1,
+        }
+        assert ViolationBuffer().severity_counts() == {}
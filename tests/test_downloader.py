@@ -0,0 +1,150 @@
+import subprocess
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.core import downloader as downloader_module
+from ..src.core.downloader import RepositoryDownloader
+
+
+@pytest.fixture
+def git_calls(tmp_path, monkeypatch):
+    """Record git commands instead of running them, with the cache in tmp_path"""
+    calls = []
+
+    def run_git(self, *args, cwd=None):
+        calls.append(args)
+        return "main"
+
+    monkeypatch.setattr(downloader_module.shutil, "which", lambda name: "/usr/bin/git")
+    monkeypatch.setattr(RepositoryDownloader, "_run_git", run_git)
+    return calls
+
+
+def git_subcommand(args) -> str:
+    """Name the git command being run, skipping a leading --git-dir option"""
+    return args[2] if args[0] == "--git-dir" else args[0]
+
+
+def make_downloader(cache_dir: Path) -> RepositoryDownloader:
+    """Build a downloader that keeps its clones in cache_dir"""
+    downloader = RepositoryDownloader()
+    downloader.config = {**downloader.config, "clone_cache_dir": str(cache_dir)}
+    return downloader
+
+
+class TestCloneRepository:
+    """Test cases for RepositoryDownloader._clone_repository"""
+
+    @pytest.mark.parametrize(
+        "repo_url",
+        [
+            "https://../github.com/x",
+            "https://github.com/owner/..",
+            "https://github.com/../../victim",
+            "https://github.com/owner/./repo",
+            "http://github.com/owner/repo",
+            "ssh://github.com/owner/repo",
+            "https://github.com:8443/owner/repo",
+            "https://example.com/owner/repo",
+            "https://github.com/owner",
+        ],
+    )
+    def test_rejected_urls_touch_nothing(self, tmp_path, git_calls, repo_url):
+        """Test unsafe or unsupported URLs fall back without running git or writing"""
+        cache_dir = tmp_path / "cache"
+        victim = tmp_path / "victim"
+        victim.mkdir()
+        (victim / "keep.txt").write_text("keep")
+
+        assert make_downloader(cache_dir)._clone_repository(repo_url) is None
+        assert git_calls == []
+        assert not cache_dir.exists()
+        assert (victim / "keep.txt").exists()
+
+    def test_symlink_out_of_cache_is_not_removed(self, tmp_path, git_calls):
+        """Test a clone path resolving outside the cache is never replaced"""
+        cache_dir = tmp_path / "cache"
+        outside = tmp_path / "outside"
+        (outside / "repo").mkdir(parents=True)
+        (outside / "repo" / "keep.txt").write_text("keep")
+        (cache_dir / "github.com").mkdir(parents=True)
+        (cache_dir / "github.com" / "owner").symlink_to(outside)
+
+        downloader = make_downloader(cache_dir)
+
+        assert downloader._clone_repository("https://github.com/owner/repo") is None
+        assert git_calls == []
+        assert (outside / "repo" / "keep.txt").exists()
+
+    def test_clone_stays_inside_cache(self, tmp_path, git_calls):
+        """Test a valid URL is cloned into the cache, with the URL after '--'"""
+        cache_dir = tmp_path / "cache"
+
+        repo_info = make_downloader(cache_dir)._clone_repository(
+            "https://github.com/owner/repo.git"
+        )
+
+        clone_dir = cache_dir.resolve() / "github.com" / "owner" / "repo"
+        assert repo_info.local_path == clone_dir
+        assert repo_info.url == "https://github.com/owner/repo"
+        clone = git_calls[0]
+        assert clone[0] == "clone"
+        assert clone[-3:] == ("--", "https://github.com/owner/repo", str(clone_dir))
+
+    def test_broken_cached_clone_is_replaced(self, tmp_path, monkeypatch):
+        """Test a cached clone without a valid HEAD is removed and cloned again"""
+        cache_dir = tmp_path / "cache"
+        clone_dir = cache_dir.resolve() / "github.com" / "owner" / "repo"
+        (clone_dir / ".git").mkdir(parents=True)
+        (clone_dir / "stale.txt").write_text("stale")
+        calls = []
+
+        def run_git(self, *args, cwd=None):
+            calls.append(git_subcommand(args))
+            if args[0] == "fetch" or "--verify" in args:
+                raise subprocess.CalledProcessError(128, ["git", *args])
+            return "main"
+
+        monkeypatch.setattr(
+            downloader_module.shutil, "which", lambda name: "/usr/bin/git"
+        )
+        monkeypatch.setattr(RepositoryDownloader, "_run_git", run_git)
+
+        repo_info = make_downloader(cache_dir)._clone_repository(
+            "https://github.com/owner/repo"
+        )
+
+        assert repo_info.local_path == clone_dir
+        assert calls == ["fetch", "rev-parse", "clone", "rev-parse", "rev-parse"]
+        assert not (clone_dir / "stale.txt").exists()
+
+    def test_failed_fetch_keeps_a_healthy_clone(self, tmp_path, monkeypatch):
+        """Test a fetch failing on a valid clone falls back without removing it"""
+        cache_dir = tmp_path / "cache"
+        clone_dir = cache_dir.resolve() / "github.com" / "owner" / "repo"
+        (clone_dir / ".git").mkdir(parents=True)
+        (clone_dir / "app.py").write_text("print('hello')")
+        calls = []
+
+        def run_git(self, *args, cwd=None):
+            calls.append(git_subcommand(args))
+            if args[0] == "fetch":
+                raise subprocess.TimeoutExpired(["git", *args], 600)
+            return "main"
+
+        monkeypatch.setattr(
+            downloader_module.shutil, "which", lambda name: "/usr/bin/git"
+        )
+        monkeypatch.setattr(RepositoryDownloader, "_run_git", run_git)
+
+        repo_info = make_downloader(cache_dir)._clone_repository(
+            "https://github.com/owner/repo"
+        )
+
+        assert repo_info is None
+        assert calls == ["fetch", "rev-parse"]
+        assert (clone_dir / "app.py").exists()
@@ -0,0 +1,86 @@
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.utils.file_utils import FileUtils
+
+TREE = [
+    "azb",
+    "a-b",
+    "a]b",
+    "a/b",
+    "app.py",
+    "setup.cfg",
+    ".env",
+    "src/main.py",
+    "src/azb",
+    "src/a/b",
+    "src/util/helpers.py",
+    "src/util/notes.txt",
+    "docs/guide.md",
+    "docs/api/index.md",
+]
+
+PATTERNS = [
+    "*.py",
+    "**/*.py",
+    "src/*.py",
+    "src/**/*.py",
+    "**/a[!x]b",
+    "a[!x]b",
+    "a[]-]b",
+    "a[!]]b",
+    "a[+-0]b",
+    "**/a[+-0]b",
+    "**/a?b",
+    "[ad]*",
+    "*/[!.]*.md",
+    "**/util/*",
+    ".*",
+    "docs/**/*.md",
+]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small directory tree of empty files"""
+    for path in TREE:
+        file_path = tmp_path / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+    return tmp_path
+
+
+def relative_files(paths, root: Path):
+    """Relative posix paths of the files among paths"""
+    return sorted(path.relative_to(root).as_posix() for path in paths if path.is_file())
+
+
+class TestFileUtils:
+    """Test cases for FileUtils class"""
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_find_files_by_pattern_matches_path_glob(self, tree, pattern):
+        """Test pattern matching agrees with Path.glob"""
+        found = FileUtils.find_files_by_pattern(tree, pattern)
+
+        assert relative_files(found, tree) == relative_files(tree.glob(pattern), tree)
+
+    def test_negated_set_does_not_cross_directories(self, tree):
+        """Test a negated character set never matches the path separator"""
+        found = FileUtils.find_files_by_pattern(tree, "**/a[!x]b")
+
+        assert "a/b" not in relative_files(found, tree)
+
+    def test_iter_files_by_patterns_walks_once_for_several_patterns(self, tree):
+        """Test files matching any of several patterns are each yielded once"""
+        found = list(FileUtils.iter_files_by_patterns(tree, ["*.py", "**/*.py"]))
+
+        assert relative_files(found, tree) == [
+            "app.py",
+            "src/main.py",
+            "src/util/helpers.py",
+        ]
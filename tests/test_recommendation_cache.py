@@ -0,0 +1,57 @@
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.services import recommendation_cache as cache_module
+from ..src.services.recommendation_cache import RecommendationCache
+
+RECOMMENDATIONS = ["Rotate the leaked keys", "Pin base image versions"]
+
+
+class TestRecommendationCache:
+    """Test cases for RecommendationCache class"""
+
+    def test_set_and_get(self, tmp_path):
+        """Test recommendations are returned for the same model and prompt"""
+        cache = RecommendationCache(tmp_path / "ai.db", ttl_seconds=60)
+        cache.set("model-a", "prompt", RECOMMENDATIONS)
+
+        assert cache.get("model-a", "prompt") == RECOMMENDATIONS
+        cache.close()
+
+    def test_key_covers_model_and_prompt(self, tmp_path):
+        """Test another model or prompt misses the cached entry"""
+        cache = RecommendationCache(tmp_path / "ai.db", ttl_seconds=60)
+        cache.set("model-a", "prompt", RECOMMENDATIONS)
+
+        assert cache.get("model-b", "prompt") is None
+        assert cache.get("model-a", "other prompt") is None
+        assert RecommendationCache.make_key(
+            "model-a", "prompt"
+        ) != RecommendationCache.make_key("model-b", "prompt")
+        cache.close()
+
+    def test_entries_expire_after_ttl(self, tmp_path, monkeypatch):
+        """Test entries older than the TTL are treated as missing"""
+        now = 1_000_000.0
+        monkeypatch.setattr(cache_module.time, "time", lambda: now)
+        cache = RecommendationCache(tmp_path / "ai.db", ttl_seconds=60)
+        cache.set("model-a", "prompt", RECOMMENDATIONS)
+
+        now += 60
+        assert cache.get("model-a", "prompt") == RECOMMENDATIONS
+        now += 1
+        assert cache.get("model-a", "prompt") is None
+        cache.close()
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test a new cache on the same file sees earlier entries"""
+        cache = RecommendationCache(tmp_path / "ai.db", ttl_seconds=60)
+        cache.set("model-a", "prompt", RECOMMENDATIONS)
+        cache.close()
+
+        cache = RecommendationCache(tmp_path / "ai.db", ttl_seconds=60)
+        assert cache.get("model-a", "prompt") == RECOMMENDATIONS
+        cache.close()
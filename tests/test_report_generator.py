@@ -0,0 +1,187 @@
+import io
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.models.compliance import ComplianceRule, ViolationBuffer
+from ..src.models.repository import RepositoryInfo
+from ..src.services import report_generator
+from ..src.services.report_generator import ReportGenerator
+
+# Markdown written before reports were streamed, for the report in make_report
+EXPECTED_MARKDOWN = """\
+# Compliance Report: repo
+
+**Repository:** https://github.com/owner/repo
+**Scan Date:** 2026-01-02T03:04:05
+**Scan Duration:** 1.50 seconds
+
+## Executive Summary
+
+**Compliance Score:** 92.0/100
+**Total Violations:** 2
+**High Severity:** 1
+**Medium Severity:** 0
+**Low Severity:** 1
+**Critical Severity:** 0
+
+## Violations Details
+
+### TEST001: Test Rule
+
+**Severity:** high
+**File:** `src/app.py`
+**Line:** 3
+**Description:** Test description
+**Compliance:** TEST, OWASP
+
+**Content:**
+```
+password = "x"
+```
+
+**Fix Suggestion:**
+Fix this
+
+---
+
+### TEST002: Presence Rule
+
+**Severity:** low
+**File:** `.env`
+**Description:** File should not exist
+**Compliance:** TEST
+
+**Content:**
+```
+File found
+```
+
+**Fix Suggestion:**
+Remove it
+
+---
+
+## Recommendations
+
+1. Rotate keys
+2. Add a SECURITY.md
+"""
+
+
+def make_violations():
+    """Build violations with and without a line number"""
+    rule = ComplianceRule(
+        id="TEST001",
+        title="Test Rule",
+        description="Test description",
+        file_patterns=["*.py"],
+        regex_patterns=["password"],
+        severity="high",
+        compliance_mapping=["TEST", "OWASP"],
+        fix_suggestion="Fix this",
+    )
+    presence_rule = ComplianceRule(
+        id="TEST002",
+        title="Presence Rule",
+        description="File should not exist",
+        file_patterns=[".env"],
+        regex_patterns=[],
+        severity="low",
+        compliance_mapping=["TEST"],
+        fix_suggestion="Remove it",
+    )
+    violations = ViolationBuffer()
+    violations.append(rule, "src/app.py", 3, 'password = "x"', "password")
+    violations.append(presence_rule, ".env", 0, "File found")
+    return list(violations)
+
+
+def make_report(
+    tmp_path, violations=None, recommendations=("Rotate keys", "Add a SECURITY.md")
+):
+    """Build a report through ReportGenerator.generate_report"""
+    generator = ReportGenerator(str(tmp_path / "reports"))
+    repo_info = RepositoryInfo("https://github.com/owner/repo", "repo", None, "main")
+    report = generator.generate_report(
+        repo_info,
+        make_violations() if violations is None else violations,
+        list(recommendations),
+        1.5,
+    )
+    report.scan_timestamp = "2026-01-02T03:04:05"
+    return generator, report
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with each of save_json_report's encoders"""
+    if request.param == "orjson":
+        if report_generator.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(report_generator, "orjson", None)
+    return request.param
+
+
+class TestReportGenerator:
+    """Test cases for ReportGenerator class"""
+
+    def test_save_json_report(self, tmp_path, encoder):
+        """Test the JSON report holds the public fields and every violation"""
+        generator, report = make_report(tmp_path)
+
+        filepath = generator.save_json_report(report)
+
+        with open(filepath, encoding="utf-8") as f:
+            data = json.load(f)
+
+        assert "_by_severity" not in data
+        assert "_by_rule" not in data
+        assert data["repository_name"] == "repo"
+        assert data["total_violations"] == 2
+        assert data["high_severity"] == 1
+        assert data["recommendations"] == ["Rotate keys", "Add a SECURITY.md"]
+        assert [violation["rule_id"] for violation in data["violations"]] == [
+            "TEST001",
+            "TEST002",
+        ]
+        assert data["violations"][0] == {
+            "rule_id": "TEST001",
+            "rule_title": "Test Rule",
+            "severity": "high",
+            "file_path": "src/app.py",
+            "line_number": 3,
+            "content": 'password = "x"',
+            "description": "Test description",
+            "compliance_mapping": ["TEST", "OWASP"],
+            "fix_suggestion": "Fix this",
+            "context": "password",
+        }
+
+    def test_markdown_matches_baseline(self, tmp_path):
+        """Test the streamed Markdown is unchanged, omitting the Line row for 0"""
+        generator, report = make_report(tmp_path)
+        output = io.StringIO()
+
+        generator._write_markdown(report, output)
+
+        assert output.getvalue() == EXPECTED_MARKDOWN
+
+    def test_markdown_without_violations(self, tmp_path):
+        """Test a clean report has only the header and summary"""
+        generator, report = make_report(tmp_path, violations=[], recommendations=())
+
+        filepath = generator.save_markdown_report(report)
+
+        assert Path(filepath).read_text(encoding="utf-8") == (
+            EXPECTED_MARKDOWN.split("\n## Violations Details")[0]
+            .replace("92.0/100", "100.0/100")
+            .replace("Violations:** 2", "Violations:** 0")
+            .replace("High Severity:** 1", "High Severity:** 0")
+            .replace("Low Severity:** 1", "Low Severity:** 0")
+        )
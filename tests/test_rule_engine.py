@@ -75,3 +75,219 @@ class TestRuleEngine:
         assert engine.match_file_pattern(Path("test.py"), rule)
         assert engine.match_file_pattern(Path("src/config/settings.py"), rule)
         assert not engine.match_file_pattern(Path("file.js"), rule)
+
+    def test_regex_pattern_matching(self):
+        """Test regex matching reports line numbers and matched text"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.py"],
+            regex_patterns=["password\\s*=", "http://[^\\s'\"]+"],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        content = 'import os\nPASSWORD = "x"\nurl = "http://example.com"\n'
+        matches = engine.match_regex_patterns(content, rule)
+
+        assert [m["line_number"] for m in matches] == [2, 3]
+        assert matches[0]["match"] == "PASSWORD ="
+        assert matches[0]["content"] == 'PASSWORD = "x"'
+        assert matches[1]["match"] == "http://example.com"
+        assert matches[1]["start_pos"] == 7
+
+    def test_literal_and_path_file_patterns(self):
+        """Test literal names match within file names and globs match at any depth"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=[".env", ".github/workflows/*.yml"],
+            regex_patterns=[],
+            severity="medium",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        assert engine.match_file_pattern(Path(".env"), rule)
+        assert engine.match_file_pattern(Path("deploy/prod.env"), rule)
+        assert engine.match_file_pattern(Path(".github/workflows/ci.yml"), rule)
+        assert engine.match_file_pattern(Path("sub/.github/workflows/ci.yml"), rule)
+        assert not engine.match_file_pattern(Path(".env_files/app.py"), rule)
+        assert not engine.match_file_pattern(Path("workflows/ci.yml"), rule)
+
+    def test_regex_matches_stay_within_a_line(self):
+        """Test patterns never match across a newline"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.yaml"],
+            regex_patterns=["jwt.*secret.*[=:]\\s*['\"]?secret['\"]?"],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        assert engine.match_regex_patterns("jwt_secret:\n  secret\n", rule) == []
+
+        matches = engine.match_regex_patterns(
+            "jwt_secret:\n  secret\njwt_secret: secret\n", rule
+        )
+        assert [m["line_number"] for m in matches] == [3]
+        assert matches[0]["match"] == "jwt_secret: secret"
+
+    @pytest.mark.parametrize(
+        "pattern, lines",
+        [
+            ("\\Akey", [1, 2]),
+            ("(?<=\\s)key", [3]),
+            ("(?<!\\s)key", [1, 2]),
+            ("key\\Z", [1, 2, 3]),
+            ("key(?!\\s)", [1, 2, 3]),
+        ],
+    )
+    def test_anchors_and_lookarounds_see_only_their_line(self, pattern, lines):
+        """Test string anchors and lookarounds behave as if each line stood alone"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.py"],
+            regex_patterns=[pattern, "never matches"],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        matches = engine.match_regex_patterns("key\nkey\n key\n", rule)
+
+        assert [m["line_number"] for m in matches] == lines
+        # Such patterns cannot be part of a whole-file pre-filter
+        assert engine._build_master_regex([rule]) is None
+
+    def test_overlapping_patterns_are_reported_separately(self):
+        """Test each pattern of a rule reports its own match, even when they overlap"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.js"],
+            regex_patterns=[
+                "console\\.log\\((.*password.*)\\)",
+                "print\\((.*password.*)\\)",
+            ],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        matches = engine.match_regex_patterns("console.log(print(password))\n", rule)
+
+        assert [m["match"] for m in matches] == [
+            "console.log(print(password))",
+            "print(password))",
+        ]
+
+    def test_invalid_patterns_are_compiled_once(self, capsys):
+        """Test a rule with no valid pattern is reported once and then skipped"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.py"],
+            regex_patterns=["password("],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+        capsys.readouterr()
+
+        assert engine.match_regex_patterns("password(\n", rule) == []
+        assert engine.match_regex_patterns("password(\n", rule) == []
+        assert capsys.readouterr().out.count("Invalid regex pattern") == 1
+
+    def test_glob_wildcards_do_not_cross_directories(self):
+        """Test wildcards in file patterns never match a path separator"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["Docker*", "a[!x]b", "src/*.py"],
+            regex_patterns=[],
+            severity="medium",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        assert engine.match_file_pattern(Path("Dockerfile"), rule)
+        assert engine.match_file_pattern(Path("app/Dockerfile.prod"), rule)
+        assert engine.match_file_pattern(Path("azb"), rule)
+        assert engine.match_file_pattern(Path("x/src/main.py"), rule)
+        assert not engine.match_file_pattern(Path("Dockerimages/readme.txt"), rule)
+        assert not engine.match_file_pattern(Path("a/b"), rule)
+        assert not engine.match_file_pattern(Path("x/src/a/b/c.py"), rule)
+
+    def test_reversed_set_range_matches_nothing(self):
+        """Test an empty range in a file pattern is dropped instead of raising"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["file[z-a].py", "log[!z-a]", "x[c-a-z]"],
+            regex_patterns=[],
+            severity="medium",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        assert not engine.match_file_pattern(Path("filea.py"), rule)
+        assert not engine.match_file_pattern(Path("filez.py"), rule)
+        assert engine.match_file_pattern(Path("log1"), rule)
+        assert not engine.match_file_pattern(Path("log/"), rule)
+        assert engine.match_file_pattern(Path("xz"), rule)
+        assert engine.match_file_pattern(Path("x-"), rule)
+        assert not engine.match_file_pattern(Path("xc"), rule)
+
+    def test_non_ascii_matches_are_whole_characters(self):
+        """Test matches over UTF-8 bytes are reported without split characters"""
+        engine = RuleEngine("config/rules.json")
+
+        rule = ComplianceRule(
+            id="TEST001",
+            title="Test Rule",
+            description="Test description",
+            file_patterns=["*.py"],
+            regex_patterns=["caf.", "p\\w+word", "naïve"],
+            severity="high",
+            compliance_mapping=["TEST"],
+            fix_suggestion="Fix this",
+        )
+
+        matches = engine.match_regex_patterns(
+            "# ünïcode\nun café, s'il vous plaît\npässword = 'x'\nNAÏVE naïve\n", rule
+        )
+
+        assert [(m["line_number"], m["match"]) for m in matches] == [
+            (2, "café"),
+            (4, "naïve"),
+        ]
+        assert matches[0]["content"] == "un café, s'il vous plaît"
@@ -0,0 +1,137 @@
+import io
+import zipfile
+import zlib
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ..src.core.cache import ScanCache
+from ..src.core.rule_engine import RuleEngine
+from ..src.core.scanner import ComplianceScanner
+from ..src.core.source import ZipRepositorySource
+from ..src.models.repository import RepositoryInfo
+
+FILES = {
+    "app.py": b'print("password is", password)\n',
+    "src/config.yaml": b"url: http://example.com\n",
+    "node_modules/lib/index.js": b"admin:admin\n",
+    ".github/workflows/ci.yml": b"on: push\n",
+    "docs/.DS_Store": b"\x00",
+}
+
+
+def make_source(root: str = "repo-main/") -> ZipRepositorySource:
+    """Build an in-memory archive laid out like a downloaded repository"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        if root:
+            zip_file.writestr(root, b"")
+        for path, content in FILES.items():
+            zip_file.writestr(root + path, content)
+    archive.seek(0)
+    return ZipRepositorySource(archive)
+
+
+class TestZipRepositorySource:
+    """Test cases for ZipRepositorySource class"""
+
+    def test_paths_are_relative_to_repository_root(self):
+        """Test the archive's top-level directory is stripped from member paths"""
+        source = make_source()
+
+        assert sorted(member.path for member in source.iter_files()) == sorted(FILES)
+        assert source.file_count == len(FILES)
+        assert source.size_bytes == sum(len(content) for content in FILES.values())
+        source.close()
+
+    def test_archive_without_common_root(self):
+        """Test paths are kept as they are when members share no root directory"""
+        source = make_source(root="")
+
+        assert sorted(member.path for member in source.iter_files()) == sorted(FILES)
+        source.close()
+
+    def test_read_and_digest(self):
+        """Test members are read by relative path and digested by their CRC"""
+        source = make_source()
+
+        assert source.read("src/config.yaml") == FILES["src/config.yaml"]
+        assert source.digest("app.py") == f"crc32:{zlib.crc32(FILES['app.py']):08x}"
+        source.close()
+
+    def test_archive_files_apply_exclusions(self):
+        """Test excluded, hidden and ignored files are left out of an archive scan"""
+        source = make_source()
+        scanner = ComplianceScanner(RuleEngine("config/rules.json"))
+
+        files = scanner._get_archive_files(source)
+
+        assert sorted(file_entry.path for file_entry in files) == [
+            "app.py",
+            "src/config.yaml",
+        ]
+        assert all(file_entry.location is None for file_entry in files)
+        source.close()
+
+    def test_pipelined_scan_skips_oversized_members(self):
+        """Test a pipelined scan matches a serial one and never reads skipped members"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("repo-main/app.py", FILES["app.py"])
+            zip_file.writestr("repo-main/big.py", FILES["app.py"] + b"#" * 4096)
+            zip_file.writestr("repo-main/lib/index.js", b"admin:admin\n")
+        archive.seek(0)
+        source = ZipRepositorySource(archive)
+
+        read_paths = []
+        read = source.read
+
+        def record_read(path):
+            read_paths.append(path)
+            return read(path)
+
+        source.read = record_read
+        repo_info = RepositoryInfo("repo", "repo", None, "main", source=source)
+        scanner = ComplianceScanner(
+            RuleEngine("config/rules.json"), max_workers=4, max_scan_bytes=1024
+        )
+        scanner.pipeline_queue_bytes = 1
+        files = scanner._get_archive_files(source)
+
+        pipelined = scanner._scan_files_pipelined(files, repo_info)
+        serial = [scanner._scan_file(file_entry, repo_info) for file_entry in files]
+
+        assert [list(violations) for violations in pipelined] == [
+            list(violations) for violations in serial
+        ]
+        assert sum(len(violations) for violations in pipelined) > 0
+        assert "big.py" not in read_paths
+        source.close()
+
+    def test_cached_archive_scan_sees_same_size_changes(self, tmp_path):
+        """Test a member changed within the same timestamp and size is rescanned"""
+
+        def make_archive(content: bytes) -> ZipRepositorySource:
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w") as zip_file:
+                member = zipfile.ZipInfo("repo-main/app.py", (2024, 1, 1, 0, 0, 0))
+                zip_file.writestr(member, content)
+            archive.seek(0)
+            return ZipRepositorySource(archive)
+
+        cache = ScanCache(tmp_path / "cache.db")
+        scanner = ComplianceScanner(
+            RuleEngine("config/rules.json"), max_workers=1, cache=cache
+        )
+
+        for content, expected in [
+            (b"print('hello, world')   \n", 0),
+            (b"print(password, 'x')    \n", 1),
+        ]:
+            source = make_archive(content)
+            repo_info = RepositoryInfo("repo", "repo", None, "main", source=source)
+            assert len(scanner.scan_repository(repo_info)) == expected
+            source.close()
+        cache.close()